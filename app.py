@@ -1,27 +1,142 @@
 from __future__ import annotations
 
+import json
 import os
 import uuid
+from collections import Counter
+from contextlib import nullcontext
 from datetime import datetime
+from io import BytesIO
+from itertools import chain, islice, product
 from pathlib import Path
+from typing import Any, BinaryIO, ContextManager
 
-from flask import Flask, jsonify, render_template, request, send_file, url_for
+from flask import Flask, Response, jsonify, render_template, request, send_file, stream_with_context, url_for
 from werkzeug.utils import secure_filename
 
-from calculator import calculate_assets, create_result_workbook, create_template, read_assets
+from cache import ResultCache, TemplateCache
+from calculator import (
+    DEFAULT_ALIAS_INDEX,
+    DEFAULT_PASSENGER_CAR_RULES,
+    DETAIL_SHEETS,
+    INPUT_FORMATS,
+    AliasIndex,
+    PassengerCarRules,
+    RateTable,
+    create_scenario_workbook,
+    create_template,
+    input_format,
+    iter_assets,
+    read_rate_table,
+)
+from engine import AssetTable, calculate_scenarios, calculate_table, iter_result_chunks
+from exports import OUTPUT_FORMATS, JournalLayout, iter_journal_entries, stream_journal, stream_results_json, stream_results_ndjson, write_results
+from jobs import Job, JobManager
+from metrics import StageTimer, create_metrics
+from projection import create_schedule_workbook, write_schedule_csv
+from registry import AssetRegistry
+from snapshots import SnapshotStore
+from storage import FileStore
 
 
 BASE_DIR = Path(__file__).resolve().parent
 UPLOAD_DIR = BASE_DIR / "uploads"
 OUTPUT_DIR = BASE_DIR / "outputs"
-ALLOWED_EXTENSIONS = {".xlsx", ".xlsm"}
+SNAPSHOT_DIR = BASE_DIR / "snapshots"
+ALLOWED_EXTENSIONS = set(INPUT_FORMATS)
+MAX_SCENARIOS = 100
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+RESULT_CACHE_MAX_AGE = int(os.environ.get("RESULT_CACHE_MAX_AGE_HOURS", "24")) * 3600
+SAVE_UPLOADS = os.environ.get("SAVE_UPLOADS") == "1"
+STORE_MAX_BYTES = int(os.environ.get("STORE_MAX_MB", "1024")) * 1024 * 1024
+STORE_TTL = int(os.environ.get("STORE_TTL_HOURS", "24")) * 3600
+STREAM_FORMATS = {"ndjson": ("application/x-ndjson", stream_results_ndjson), "json": ("application/json", stream_results_json)}
+STORE_SWEEP_INTERVAL = int(os.environ.get("STORE_SWEEP_SECONDS", "300"))
+SNAPSHOT_MAX_BYTES = int(os.environ.get("SNAPSHOT_MAX_MB", "2048")) * 1024 * 1024
+SNAPSHOT_TTL = int(os.environ.get("SNAPSHOT_TTL_DAYS", "120")) * 86400
+COLUMN_PROFILES_PATH = os.environ.get("COLUMN_PROFILES")
+PASSENGER_CAR_RULES_PATH = os.environ.get("PASSENGER_CAR_RULES")
+RATE_TABLE_PATH = os.environ.get("UFE_TABLE")
+TEMPLATE_MAX_AGE = int(os.environ.get("TEMPLATE_MAX_AGE_HOURS", "24")) * 3600
+TEMPLATE_NAME = "SABLON_SABIT_KIYMET_LISTESI.xlsx"
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+REGISTRY_PATH = os.environ.get("REGISTRY_PATH", str(BASE_DIR / "registry.sqlite3"))
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
     app.config["MAX_CONTENT_LENGTH"] = 20 * 1024 * 1024
-    UPLOAD_DIR.mkdir(exist_ok=True)
-    OUTPUT_DIR.mkdir(exist_ok=True)
+    app.logger.setLevel(LOG_LEVEL)
+    metrics = create_metrics()
+    uploads = FileStore(UPLOAD_DIR, max_bytes=STORE_MAX_BYTES, ttl_seconds=STORE_TTL)
+    outputs = FileStore(OUTPUT_DIR, max_bytes=STORE_MAX_BYTES, ttl_seconds=STORE_TTL)
+    uploads.start_sweeper(STORE_SWEEP_INTERVAL)
+    outputs.start_sweeper(STORE_SWEEP_INTERVAL)
+    snapshot_files = FileStore(SNAPSHOT_DIR, max_bytes=SNAPSHOT_MAX_BYTES, ttl_seconds=SNAPSHOT_TTL)
+    snapshot_files.start_sweeper(STORE_SWEEP_INTERVAL)
+    passenger_rules = _load_passenger_rules(PASSENGER_CAR_RULES_PATH)
+    default_rates = read_rate_table(RATE_TABLE_PATH, input_format(RATE_TABLE_PATH)) if RATE_TABLE_PATH else None
+    snapshots = SnapshotStore(snapshot_files, salt=passenger_rules.fingerprint)
+    registry = AssetRegistry(REGISTRY_PATH, rules=passenger_rules)
+    jobs = JobManager(max_workers=JOB_WORKERS)
+    profiles = _load_column_profiles(COLUMN_PROFILES_PATH)
+    cache = ResultCache(outputs, max_age_seconds=RESULT_CACHE_MAX_AGE)
+    templates = TemplateCache({"": create_template})
+
+    def store_result(cache_key: str, output_path: Path, summary: dict[str, Any]) -> None:
+        cache.put(cache_key, output_path, summary)
+
+    def load_register(snapshot_id: str, uploaded) -> AssetTable:
+        if not snapshot_id:
+            content = uploaded.read()
+            snapshot_id = snapshots.key(content)
+            if snapshot_id not in snapshots:
+                formats: dict[str, str] = {}
+                hits: Counter[str] = Counter()
+                rows = iter_assets(BytesIO(content), formats=formats, file_format=input_format(uploaded.filename))
+                table = AssetTable.from_assets(rows, passenger_rules, hits)
+                snapshots.save(snapshot_id, table, kaynak=uploaded.filename, kolon_bicimleri=formats, binek_kurallari=hits)
+                return table
+        return snapshots.load(snapshot_id)[0]
+
+    def register_error(snapshot_id: str, uploaded) -> tuple[Any, int] | None:
+        if snapshot_id:
+            if snapshot_id not in snapshots:
+                return jsonify(success=False, error="Kayıt bulunamadı."), 404
+            return None
+        upload_error = _upload_error(uploaded)
+        return (jsonify(success=False, error=upload_error), 400) if upload_error else None
+
+    def request_rates(islem_yili: int) -> RateTable | None:
+        uploaded = request.files.get("ufe_tablosu")
+        reference = request.form.get("ufe_referans", "").strip()
+        if uploaded and uploaded.filename:
+            file_format = input_format(uploaded.filename)
+            if file_format is None:
+                raise ValueError("ÜFE tablosu .xlsx, .csv veya .json formatında olmalıdır.")
+            rates = read_rate_table(BytesIO(uploaded.read()), file_format, reference)
+        elif request.form.get("ufe") == "1":
+            if default_rates is None:
+                raise ValueError("Sunucuda ÜFE tablosu tanımlı değil.")
+            rates = default_rates.with_reference(reference) if reference else default_rates
+        else:
+            return None
+        rates.rates(islem_yili)
+        return rates
+
+    def finish_request(timer: StageTimer, status: str, output_path: Path | None = None) -> dict[str, Any]:
+        if output_path is not None and output_path.exists():
+            size = output_path.stat().st_size
+            timer.count("output_bytes", size)
+            metrics.observe("yd_file_size_bytes", size, kind="output")
+        if "rows_accepted" in timer.counts:
+            metrics.inc("yd_rows_total", timer.counts["rows_accepted"], result="accepted")
+            metrics.inc("yd_rows_total", timer.counts["rows_dropped"], result="dropped")
+            metrics.observe("yd_rows_per_upload", timer.counts["rows_accepted"])
+        report = timer.finish(status)
+        app.logger.info("%s %s %s", timer.endpoint, status, json.dumps(report, ensure_ascii=False))
+        return report
 
     @app.get("/")
     def index():
@@ -29,19 +144,28 @@ def create_app() -> Flask:
 
     @app.get("/sablon-indir")
     def download_template():
-        path = OUTPUT_DIR / "SABLON_SABIT_KIYMET_LISTESI.xlsx"
-        create_template(path)
-        return send_file(path, as_attachment=True, download_name="SABLON_SABIT_KIYMET_LISTESI.xlsx")
+        template = templates.get()
+        response = send_file(
+            BytesIO(template.content),
+            mimetype=XLSX_MIMETYPE,
+            as_attachment=True,
+            download_name=TEMPLATE_NAME,
+            etag=template.etag,
+            last_modified=template.last_modified,
+            max_age=TEMPLATE_MAX_AGE,
+        )
+        response.cache_control.public = True
+        return response
 
     @app.post("/hesapla")
     def calculate():
+        timer = StageTimer(metrics, "hesapla")
+        timing = request.form.get("timing", request.args.get("timing")) == "1"
+        snapshot_id = request.form.get("kayit_id", "")
         uploaded = request.files.get("excel_file")
-        if not uploaded or uploaded.filename == "":
-            return jsonify(success=False, error="Excel dosyası seçilmedi."), 400
-
-        extension = Path(uploaded.filename).suffix.lower()
-        if extension not in ALLOWED_EXTENSIONS:
-            return jsonify(success=False, error="Lütfen .xlsx formatında Excel dosyası yükleyin."), 400
+        error = register_error(snapshot_id, uploaded)
+        if error:
+            return error
 
         try:
             islem_yili = int(request.form.get("islem_yili", "2025"))
@@ -49,42 +173,475 @@ def create_app() -> Flask:
             yd_orani = _parse_rate(request.form.get("yd_orani", "0"))
         except ValueError:
             return jsonify(success=False, error="Yıl, dönem veya oran formatı hatalı."), 400
+        profile = request.form.get("profil", "")
+        if profile and profile not in profiles:
+            return jsonify(success=False, error=f"Kolon profili bulunamadı: {profile}"), 400
+        aliases = profiles.get(profile, DEFAULT_ALIAS_INDEX)
+        output_format = request.form.get("format", request.args.get("format", "xlsx"))
+        if output_format not in OUTPUT_FORMATS:
+            return jsonify(success=False, error="Desteklenmeyen çıktı biçimi."), 400
+        sheets = tuple(sorted({item.strip() for value in request.form.getlist("sayfalar") for item in value.split(",") if item.strip()}))
+        if set(sheets) - set(DETAIL_SHEETS):
+            return jsonify(success=False, error=f"Bilinmeyen sayfa. Seçilebilecek sayfalar: {', '.join(DETAIL_SHEETS)}"), 400
+        if sheets and output_format != "xlsx":
+            return jsonify(success=False, error="Ek sayfalar yalnızca xlsx çıktısında seçilebilir."), 400
+        exact = request.form.get("tam_kurus") == "1"
+        try:
+            rates = request_rates(islem_yili)
+        except ValueError as exc:
+            return jsonify(success=False, error=str(exc)), 400
+
+        content = b""
+        if not snapshot_id:
+            with timer.stage("save"):
+                content = uploaded.read()
+            timer.count("upload_bytes", len(content))
+            metrics.observe("yd_file_size_bytes", len(content), kind="upload")
+            snapshot_id = snapshots.key(content, profile)
+        cache_key = ResultCache.key(snapshot_id, islem_yili, donem, yd_orani, output_format=output_format, sheets=sheets, exact=exact, rates=rates.fingerprint if rates else "")
+        cached = cache.get(cache_key)
+        if cached:
+            report = finish_request(timer, "cached")
+            return jsonify(
+                success=True,
+                cached=True,
+                download_url=url_for("download_result", file_id=cached.output_path.name),
+                **cached.summary,
+                **({"timing": report} if timing else {}),
+            )
 
         token = uuid.uuid4().hex
-        filename = secure_filename(uploaded.filename) or f"upload{extension}"
-        upload_path = UPLOAD_DIR / f"{token}_{filename}"
         period_name = {1: "1Donem", 2: "2Donem", 3: "3Donem", 4: "Yillik"}.get(donem, "Yillik")
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = OUTPUT_DIR / f"YD_Amortisman_Sonuc_{islem_yili}_{period_name}_{timestamp}_{token}.xlsx"
-        uploaded.save(upload_path)
+        output_path = outputs.path(f"YD_Amortisman_Sonuc_{islem_yili}_{period_name}_{timestamp}_{token}{OUTPUT_FORMATS[output_format]}")
+        file_format = input_format(uploaded.filename) if content else None
+        source: BinaryIO | Path = BytesIO(content)
+        if SAVE_UPLOADS and content:
+            with timer.stage("save"):
+                filename = secure_filename(uploaded.filename) or f"upload{Path(uploaded.filename).suffix.lower()}"
+                source = uploads.path(f"{token}_{filename}")
+                source.write_bytes(content)
+                uploads.add(source)
+
+        if request.form.get("async") == "1":
+            def run(job: Job) -> dict:
+                try:
+                    summary = _run_pipeline(
+                        source, output_path, islem_yili, donem, yd_orani, aliases, file_format, output_format, job=job, timer=timer, snapshots=snapshots, rules=passenger_rules, sheets=sheets, exact=exact, rates=rates, snapshot_id=snapshot_id, source_name=uploaded and uploaded.filename
+                    )
+                except Exception:
+                    finish_request(timer, "error")
+                    raise
+                store_result(cache_key, output_path, summary)
+                report = finish_request(timer, "ok", output_path)
+                return {"output_file": output_path.name, **summary, **({"timing": report} if timing else {})}
+
+            job = jobs.submit(run)
+            return jsonify(success=True, job_id=job.id, status_url=url_for("job_status", job_id=job.id)), 202
+
+        try:
+            summary = _run_pipeline(
+                source, output_path, islem_yili, donem, yd_orani, aliases, file_format, output_format, timer=timer, snapshots=snapshots, rules=passenger_rules, sheets=sheets, exact=exact, rates=rates, snapshot_id=snapshot_id, source_name=uploaded and uploaded.filename
+            )
+        except Exception as exc:
+            report = finish_request(timer, "error")
+            return jsonify(success=False, error=str(exc), **({"timing": report} if timing else {})), 400
+        store_result(cache_key, output_path, summary)
+        report = finish_request(timer, "ok", output_path)
+
+        return jsonify(
+            success=True,
+            download_url=url_for("download_result", file_id=output_path.name),
+            **summary,
+            **({"timing": report} if timing else {}),
+        )
+
+    @app.post("/api/hesapla")
+    def calculate_stream():
+        uploaded = request.files.get("excel_file")
+        upload_error = _upload_error(uploaded)
+        if upload_error:
+            return jsonify(success=False, error=upload_error), 400
+
+        try:
+            islem_yili = int(request.form.get("islem_yili", "2025"))
+            donem = int(request.form.get("donem", "4"))
+            yd_orani = _parse_rate(request.form.get("yd_orani", "0"))
+        except ValueError:
+            return jsonify(success=False, error="Yıl, dönem veya oran formatı hatalı."), 400
+        profile = request.form.get("profil", "")
+        if profile and profile not in profiles:
+            return jsonify(success=False, error=f"Kolon profili bulunamadı: {profile}"), 400
+        output_format = request.form.get("format", request.args.get("format", "ndjson"))
+        if output_format not in STREAM_FORMATS:
+            return jsonify(success=False, error="Desteklenmeyen çıktı biçimi."), 400
+        mimetype, stream = STREAM_FORMATS[output_format]
+        exact = request.form.get("tam_kurus") == "1"
+        try:
+            rates = request_rates(islem_yili)
+        except ValueError as exc:
+            return jsonify(success=False, error=str(exc)), 400
+
+        rows = iter_assets(
+            BytesIO(uploaded.read()),
+            aliases=profiles.get(profile, DEFAULT_ALIAS_INDEX),
+            file_format=input_format(uploaded.filename),
+        )
+        chunks = iter_result_chunks(rows, islem_yili, donem, yd_orani, rules=passenger_rules, exact=exact, rates=rates)
+        try:
+            first = list(islice(chunks, 1))
+        except Exception as exc:
+            return jsonify(success=False, error=str(exc)), 400
+        return Response(stream_with_context(stream(chain(first, chunks))), mimetype=mimetype)
+
+    @app.post("/hesapla/senaryolar")
+    def calculate_sweep():
+        snapshot_id = request.form.get("kayit_id", "")
+        uploaded = request.files.get("excel_file")
+        error = register_error(snapshot_id, uploaded)
+        if error:
+            return error
+
+        try:
+            scenarios = _parse_scenarios(request.form)
+        except (ValueError, TypeError, KeyError):
+            return jsonify(success=False, error="Senaryo listesi hatalı."), 400
+        if not scenarios:
+            return jsonify(success=False, error="En az bir senaryo girilmelidir."), 400
+        if len(scenarios) > MAX_SCENARIOS:
+            return jsonify(success=False, error=f"En fazla {MAX_SCENARIOS} senaryo hesaplanabilir."), 400
+
+        try:
+            assets = load_register(snapshot_id, uploaded)
+            summaries = calculate_scenarios(assets, scenarios)
+        except Exception as exc:
+            return jsonify(success=False, error=str(exc)), 400
+
+        if request.form.get("format", request.args.get("format", "json")) != "xlsx":
+            return jsonify(success=True, senaryo_sayisi=len(summaries), senaryolar=summaries)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = outputs.path(f"YD_Senaryo_Karsilastirma_{timestamp}_{uuid.uuid4().hex}.xlsx")
+        create_scenario_workbook(summaries, output_path)
+        outputs.add(output_path)
+        return jsonify(
+            success=True,
+            senaryo_sayisi=len(summaries),
+            download_url=url_for("download_result", file_id=output_path.name),
+        )
+
+    @app.post("/hesapla/plan")
+    def calculate_schedule():
+        snapshot_id = request.form.get("kayit_id", "")
+        uploaded = request.files.get("excel_file")
+        error = register_error(snapshot_id, uploaded)
+        if error:
+            return error
+
+        try:
+            islem_yili = int(request.form.get("islem_yili", "2025"))
+            yd_orani = _parse_rate(request.form.get("yd_orani", "0"))
+        except ValueError:
+            return jsonify(success=False, error="Yıl veya oran formatı hatalı."), 400
+        output_format = request.form.get("format", request.args.get("format", "xlsx"))
+        if output_format not in ("xlsx", "csv"):
+            return jsonify(success=False, error="Desteklenmeyen çıktı biçimi."), 400
 
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = outputs.path(f"Amortisman_Plani_{islem_yili}_{timestamp}_{uuid.uuid4().hex}.{output_format}")
         try:
-            assets = read_assets(upload_path)
-            results = calculate_assets(assets, islem_yili, donem, yd_orani)
-            summary = create_result_workbook(results, output_path, islem_yili, donem, yd_orani)
+            assets = load_register(snapshot_id, uploaded)
+            if output_format == "csv":
+                with output_path.open("w", newline="", encoding="utf-8-sig") as stream:
+                    summary = write_schedule_csv(assets, stream, islem_yili, yd_orani)
+            else:
+                summary = create_schedule_workbook(assets, output_path, islem_yili, yd_orani)
         except Exception as exc:
+            output_path.unlink(missing_ok=True)
             return jsonify(success=False, error=str(exc)), 400
+        outputs.add(output_path)
 
         return jsonify(
             success=True,
             download_url=url_for("download_result", file_id=output_path.name),
+            sabit_kiymet_sayisi=len(assets),
             **summary,
         )
 
+    @app.post("/hesapla/yevmiye")
+    def export_journal():
+        timer = StageTimer(metrics, "yevmiye")
+        snapshot_id = request.form.get("kayit_id", "")
+        uploaded = request.files.get("excel_file")
+        error = register_error(snapshot_id, uploaded)
+        if error:
+            return error
+
+        try:
+            islem_yili = int(request.form.get("islem_yili", "2025"))
+            donem = int(request.form.get("donem", "4"))
+            yd_orani = _parse_rate(request.form.get("yd_orani", "0"))
+        except ValueError:
+            return jsonify(success=False, error="Yıl, dönem veya oran formatı hatalı."), 400
+        try:
+            layout = JournalLayout.from_options(request.values)
+            rates = request_rates(islem_yili)
+            with timer.stage("parse"):
+                assets = load_register(snapshot_id, uploaded)
+            with timer.stage("calculate"):
+                results = calculate_table(assets, islem_yili, donem, yd_orani, request.form.get("tam_kurus") == "1", rates)
+            layout.check(results)
+        except Exception as exc:
+            finish_request(timer, "error")
+            return jsonify(success=False, error=str(exc)), 400
+        finish_request(timer, "ok")
+
+        period_name = {1: "1Donem", 2: "2Donem", 3: "3Donem", 4: "Yillik"}.get(donem, "Yillik")
+        entries = iter_journal_entries(results, islem_yili, donem, detail=request.values.get("detay") == "1")
+        response = Response(stream_with_context(stream_journal(entries, layout)), content_type=layout.content_type)
+        response.headers["Content-Disposition"] = f'attachment; filename="Yevmiye_{islem_yili}_{period_name}{layout.extension}"'
+        return response
+
+    @app.get("/jobs/<job_id>")
+    def job_status(job_id: str):
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify(success=False, error="İşlem bulunamadı."), 404
+        payload = job.to_dict()
+        if job.state == "done" and job.result:
+            payload.update(job.result)
+            payload["download_url"] = url_for("download_result", file_id=job.result["output_file"])
+        return jsonify(success=True, **payload)
+
     @app.get("/download/<file_id>")
     def download_result(file_id: str):
-        path = OUTPUT_DIR / secure_filename(file_id)
+        timer = StageTimer(metrics, "download")
+        path = outputs.path(secure_filename(file_id))
         if not path.exists():
+            finish_request(timer, "not_found")
             return jsonify(success=False, error="Sonuç dosyası bulunamadı."), 404
-        return send_file(path, as_attachment=True, download_name=file_id)
+        outputs.touch(path.name)
+        with timer.stage("send"):
+            response = send_file(path, as_attachment=True, download_name=file_id, etag=cache.etag(path.name) or True, max_age=RESULT_CACHE_MAX_AGE)
+        response.cache_control.public = False
+        response.cache_control.private = True
+        if response.status_code == 304:
+            finish_request(timer, "not_modified")
+        else:
+            finish_request(timer, "ok", path)
+        return response
+
+    @app.get("/metrics")
+    def metrics_endpoint():
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    @app.get("/storage")
+    def storage_status():
+        return jsonify(success=True, uploads=uploads.stats(), outputs=outputs.stats(), snapshots=snapshot_files.stats())
+
+    @app.get("/kayitlar")
+    def list_snapshots():
+        return jsonify(success=True, kayitlar=snapshots.list())
+
+    @app.get("/kayitlar/<snapshot_id>")
+    def snapshot_detail(snapshot_id: str):
+        if snapshot_id not in snapshots:
+            return jsonify(success=False, error="Kayıt bulunamadı."), 404
+        return jsonify(success=True, **snapshots.meta(snapshot_id))
+
+    @app.get("/sicil")
+    def list_registers():
+        return jsonify(success=True, siciller=registry.registers())
+
+    @app.post("/sicil/<name>/yukle")
+    def upload_register(name: str):
+        timer = StageTimer(metrics, "sicil_yukle")
+        uploaded = request.files.get("excel_file")
+        disposals = [item.strip() for value in request.form.getlist("cikis") for item in value.split(",") if item.strip()]
+        if uploaded and uploaded.filename:
+            upload_error = _upload_error(uploaded)
+            if upload_error:
+                return jsonify(success=False, error=upload_error), 400
+        elif not disposals:
+            return jsonify(success=False, error="Dosya veya çıkarılacak kıymet seçilmedi."), 400
+
+        counts: dict[str, int] = {}
+        try:
+            assets = []
+            if uploaded and uploaded.filename:
+                with timer.stage("parse"):
+                    assets = list(iter_assets(BytesIO(uploaded.read()), file_format=input_format(uploaded.filename), counts=counts))
+            with timer.stage("apply"):
+                changes = registry.apply(name, assets, disposals, replace=request.form.get("tam") == "1")
+        except Exception as exc:
+            finish_request(timer, "error")
+            return jsonify(success=False, error=str(exc)), 400
+        for key, value in counts.items():
+            timer.count(key, value)
+        finish_request(timer, "ok")
+        return jsonify(success=True, sicil=name, **changes)
+
+    @app.post("/sicil/<name>/hesapla")
+    def calculate_register(name: str):
+        timer = StageTimer(metrics, "sicil_hesapla")
+        try:
+            islem_yili = int(request.form.get("islem_yili", "2025"))
+            donem = int(request.form.get("donem", "4"))
+            yd_orani = _parse_rate(request.form.get("yd_orani", "0"))
+        except ValueError:
+            return jsonify(success=False, error="Yıl, dönem veya oran formatı hatalı."), 400
+        output_format = request.form.get("format", request.args.get("format", ""))
+        if output_format and output_format not in OUTPUT_FORMATS:
+            return jsonify(success=False, error="Desteklenmeyen çıktı biçimi."), 400
+
+        try:
+            if not output_format:
+                with timer.stage("calculate"):
+                    vouchers = registry.vouchers(name, islem_yili, donem, yd_orani)
+                finish_request(timer, "ok")
+                return jsonify(
+                    success=True,
+                    sicil=name,
+                    **vouchers.summary(),
+                    toplamlar=vouchers.totals,
+                    yd_fisleri=vouchers.revaluation,
+                    amortisman_fisleri=vouchers.depreciation,
+                )
+
+            with timer.stage("load"):
+                assets = registry.table(name)
+            if not len(assets):
+                raise ValueError("Sicilde hesaplanacak sabit kıymet bulunamadı.")
+            with timer.stage("calculate"):
+                results = calculate_table(assets, islem_yili, donem, yd_orani)
+            output_path = outputs.path(f"YD_Sicil_{secure_filename(name)}_{islem_yili}_{donem}_{uuid.uuid4().hex}{OUTPUT_FORMATS[output_format]}")
+            with timer.stage("write"):
+                summary = write_results(results, output_path, output_format, islem_yili, donem, yd_orani)
+        except Exception as exc:
+            finish_request(timer, "error")
+            return jsonify(success=False, error=str(exc)), 400
+        outputs.add(output_path)
+        finish_request(timer, "ok", output_path)
+        return jsonify(success=True, sicil=name, download_url=url_for("download_result", file_id=output_path.name), **summary)
 
     return app
 
 
+def _run_pipeline(
+    source: BinaryIO | Path,
+    output_path: Path,
+    islem_yili: int,
+    donem: int,
+    yd_orani: float,
+    aliases: AliasIndex = DEFAULT_ALIAS_INDEX,
+    file_format: str | None = None,
+    output_format: str = "xlsx",
+    job: Job | None = None,
+    timer: StageTimer | None = None,
+    snapshots: SnapshotStore | None = None,
+    snapshot_id: str | None = None,
+    source_name: str | None = None,
+    rules: PassengerCarRules = DEFAULT_PASSENGER_CAR_RULES,
+    sheets: tuple[str, ...] = (),
+    exact: bool = False,
+    rates: RateTable | None = None,
+) -> dict[str, Any]:
+    if job:
+        job.stage = "parse"
+    if snapshots is not None and snapshot_id in snapshots:
+        with _stage(timer, "load"):
+            assets, meta = snapshots.load(snapshot_id)
+        formats = meta.get("kolon_bicimleri", {})
+        hits = meta.get("binek_kurallari", {})
+        if job:
+            job.set_progress("rows_parsed", len(assets))
+    else:
+        formats = {}
+        hits = Counter()
+        counts: dict[str, int] = {}
+        rows = iter_assets(source, aliases=aliases, formats=formats, file_format=file_format, counts=counts)
+        if job:
+            rows = job.count("rows_parsed", rows)
+        with _stage(timer, "parse"):
+            assets = AssetTable.from_assets(rows, rules, hits)
+        if timer:
+            for name, value in counts.items():
+                timer.count(name, value)
+        if snapshots is not None and snapshot_id:
+            with _stage(timer, "snapshot"):
+                snapshots.save(snapshot_id, assets, kaynak=source_name, kolon_bicimleri=formats, binek_kurallari=hits, **counts)
+
+    if job:
+        job.stage = "calculate"
+    with _stage(timer, "calculate"):
+        results = calculate_table(assets, islem_yili, donem, yd_orani, exact, rates)
+    if job:
+        job.set_progress("rows_calculated", len(results))
+        job.stage = "write"
+    sheet_stats: dict[str, dict[str, float]] = {}
+    with _stage(timer, "write"):
+        summary = write_results(
+            results,
+            output_path,
+            output_format,
+            islem_yili,
+            donem,
+            yd_orani,
+            progress=(lambda rows: job.set_progress("rows_written", rows)) if job else None,
+            sheets=sheets,
+            sheet_stats=sheet_stats,
+            rates=rates,
+        )
+    report = {"sayfalar": sheet_stats} if sheet_stats else {}
+    report["kiymet_basina_bellek_bayt"] = round(results.memory_per_asset, 1)
+    if rates:
+        report["ufe_referans"] = rates.rates(islem_yili)[0]
+    return {**summary, **report, "kolon_bicimleri": formats, "binek_kurallari": dict(hits), "kayit_id": snapshot_id}
+
+
+def _stage(timer: StageTimer | None, name: str) -> ContextManager[None]:
+    return timer.stage(name) if timer else nullcontext()
+
+
 def _parse_rate(value: str) -> float:
     return float(str(value).strip().replace(",", "."))
 
 
+def _load_column_profiles(path: str | None) -> dict[str, AliasIndex]:
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as stream:
+        profiles = json.load(stream)
+    return {name: DEFAULT_ALIAS_INDEX.extended(aliases) for name, aliases in profiles.items()}
+
+
+def _load_passenger_rules(path: str | None) -> PassengerCarRules:
+    if not path:
+        return DEFAULT_PASSENGER_CAR_RULES
+    with open(path, encoding="utf-8") as stream:
+        return PassengerCarRules.from_config(json.load(stream))
+
+
+def _upload_error(uploaded) -> str | None:
+    if not uploaded or uploaded.filename == "":
+        return "Dosya seçilmedi."
+    if Path(uploaded.filename).suffix.lower() not in ALLOWED_EXTENSIONS:
+        return "Lütfen .xlsx, .csv, .json veya .parquet formatında dosya yükleyin."
+    return None
+
+
+def _parse_scenarios(form) -> list[tuple[int, int, float]]:
+    if form.get("senaryolar"):
+        return [
+            (int(item["islem_yili"]), int(item["donem"]), _parse_rate(item["yd_orani"]))
+            for item in json.loads(form["senaryolar"])
+        ]
+    years = [int(value) for value in form.getlist("islem_yili")] or [2025]
+    periods = [int(value) for value in form.getlist("donem")] or [4]
+    rates = [_parse_rate(value) for value in form.getlist("yd_orani")] or [0.0]
+    return list(product(years, periods, rates))
+
+
 app = create_app()
 
 
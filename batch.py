@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+from calculator import (
+    CALCULATOR_VERSION,
+    DEFAULT_ALIAS_INDEX,
+    PASSENGER_CAR_RULES,
+    PassengerCarRules,
+    RateTable,
+    VoucherAggregator,
+    add_result_styles,
+    calculate_assets,
+    input_format,
+    period_label,
+    read_assets,
+    read_rate_table,
+    styled,
+)
+from exports import OUTPUT_FORMATS, iter_voucher_lines, write_results
+
+
+STATE_FILE = "toplu_durum.json"
+SUMMARY_FILE = "Toplu_Ozet.xlsx"
+DEFAULT_PARAMETERS = {"islem_yili": 2025, "donem": 4, "yd_orani": 0.0, "format": "xlsx"}
+
+
+def discover_inputs(source: str | Path) -> list[tuple[str, str | None]]:
+    source = Path(source)
+    if source.is_dir():
+        names = sorted(path.relative_to(source).as_posix() for path in source.rglob("*") if path.is_file())
+        return [(name, None) for name in names if _is_register(name)]
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            return [(name, name) for name in sorted(archive.namelist()) if not name.endswith("/") and _is_register(name)]
+    raise ValueError(f"Klasör veya zip dosyası bekleniyordu: {source}")
+
+
+def load_parameters(path: str | Path) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as stream:
+        parameters = json.load(stream)
+    parameters = {**DEFAULT_PARAMETERS, **parameters}
+    if parameters["format"] not in OUTPUT_FORMATS:
+        raise ValueError(f"Desteklenmeyen çıktı biçimi: {parameters['format']}")
+    return parameters
+
+
+def file_parameters(parameters: dict[str, Any], name: str) -> dict[str, Any]:
+    overrides = parameters.get("sirketler", {})
+    values = {**parameters, **overrides.get(name, overrides.get(Path(name).name, {}))}
+    return {
+        "islem_yili": int(values["islem_yili"]),
+        "donem": int(values["donem"]),
+        "yd_orani": float(str(values["yd_orani"]).replace(",", ".")),
+        "format": values["format"],
+        "kolonlar": values.get("kolonlar", {}),
+        "binek_kurallari": values.get("binek_kurallari", PASSENGER_CAR_RULES),
+        "tam_kurus": bool(values.get("tam_kurus", False)),
+        "ufe": _rate_config(values.get("ufe_tablosu"), values.get("ufe_referans")),
+    }
+
+
+def process_file(source: str, member: str | None, name: str, output_path: str, parameters: dict[str, Any], engine: str = "numpy") -> dict[str, Any]:
+    started = time.perf_counter()
+    content = _read_source(source, member, name)
+    aliases = DEFAULT_ALIAS_INDEX.extended(parameters["kolonlar"]) if parameters["kolonlar"] else DEFAULT_ALIAS_INDEX
+    assets = read_assets(BytesIO(content), max_rows=None, aliases=aliases, file_format=input_format(name))
+    vouchers = VoucherAggregator()
+    rules = PassengerCarRules.from_config(parameters["binek_kurallari"])
+    rates = RateTable.from_config(parameters["ufe"]) if parameters["ufe"] else None
+    results = calculate_assets(
+        assets, parameters["islem_yili"], parameters["donem"], parameters["yd_orani"], engine=engine, aggregator=vouchers, rules=rules, exact=parameters["tam_kurus"], rates=rates
+    )
+    output_path = Path(output_path)
+    temporary = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    write_results(results, temporary, parameters["format"], parameters["islem_yili"], parameters["donem"], parameters["yd_orani"], rates=rates)
+    os.replace(temporary, output_path)
+    return {
+        **vouchers.summary(),
+        "toplamlar": vouchers.totals,
+        "yd_fisleri": vouchers.revaluation,
+        "amortisman_fisleri": vouchers.depreciation,
+        "sure": round(time.perf_counter() - started, 3),
+    }
+
+
+def run_batch(
+    source: str | Path,
+    parameters: dict[str, Any],
+    output_dir: str | Path,
+    workers: int | None = None,
+    engine: str = "numpy",
+    force: bool = False,
+) -> dict[str, Any]:
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    state_path = output_dir / STATE_FILE
+    state = {} if force or not state_path.exists() else json.loads(state_path.read_text(encoding="utf-8"))
+    inputs = discover_inputs(source)
+    output_names = _output_names([name for name, _ in inputs])
+
+    pending = []
+    for name, member in inputs:
+        settings = file_parameters(parameters, name)
+        key = _input_key(_read_source(str(source), member, name), settings)
+        output_path = output_dir / (output_names[name] + OUTPUT_FORMATS[settings["format"]])
+        entry = state.get(name)
+        if entry and entry.get("anahtar") == key and entry.get("durum") == "tamam" and output_path.exists():
+            print(f"atlandı   {name}", file=sys.stderr)
+            continue
+        pending.append((name, member, key, settings, output_path))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(process_file, str(source), member, name, str(output_path), settings, engine): (name, key, settings, output_path)
+            for name, member, key, settings, output_path in pending
+        }
+        for future in as_completed(futures):
+            name, key, settings, output_path = futures[future]
+            entry: dict[str, Any] = {"anahtar": key, **{field: settings[field] for field in ("islem_yili", "donem", "yd_orani")}}
+            try:
+                entry.update(future.result(), durum="tamam", cikti=output_path.name)
+                print(f"tamam     {name} ({entry['sabit_kiymet_sayisi']} kıymet, {entry['sure']} sn)", file=sys.stderr)
+            except Exception as exc:
+                entry.update(durum="hata", hata=str(exc))
+                print(f"hata      {name}: {exc}", file=sys.stderr)
+            entry["zaman"] = datetime.now().isoformat(timespec="seconds")
+            state[name] = entry
+            _write_state(state_path, state)
+
+    companies = [{"dosya": name, **state[name]} for name, _ in inputs if name in state]
+    create_company_summary_workbook(companies, output_dir / SUMMARY_FILE)
+    return {
+        "dosya_sayisi": len(inputs),
+        "islenen": len(pending),
+        "atlanan": len(inputs) - len(pending),
+        "hatali": sum(1 for company in companies if company["durum"] != "tamam"),
+    }
+
+
+def create_company_summary_workbook(companies: list[dict[str, Any]], output_path: str | Path) -> None:
+    workbook = Workbook(write_only=True)
+    styles = add_result_styles(workbook)
+
+    sheet = workbook.create_sheet("Şirket Özeti")
+    headers = ["Dosya", "İşlem Yılı", "Dönem", "YD Oranı", "Sabit Kıymet", "YD Artışı", "Birikmiş Amort. Artışı", "YD Fonu", "Dönem Amortismanı", "YD Fiş Sayısı", "Amortisman Fiş Sayısı", "Durum"]
+    for col, width in enumerate([32, 12, 12, 12, 14, 18, 20, 18, 20, 14, 20, 40], start=1):
+        sheet.column_dimensions[get_column_letter(col)].width = width
+    sheet.freeze_panes = "A2"
+    sheet.append([styled(sheet, header, styles["result_header"]) for header in headers])
+    for company in companies:
+        if company["durum"] != "tamam":
+            sheet.append([company["dosya"], company["islem_yili"], period_label(company["donem"]), None, None, None, None, None, None, None, None, company["hata"]])
+            continue
+        totals = company["toplamlar"]
+        sheet.append(
+            [
+                company["dosya"],
+                company["islem_yili"],
+                period_label(company["donem"]),
+                styled(sheet, company["yd_orani"] / 100, styles["result_percent"]),
+                company["sabit_kiymet_sayisi"],
+                styled(sheet, totals["revaluation_increase"], styles["result_amount"]),
+                styled(sheet, totals["accumulated_increase"], styles["result_amount"]),
+                styled(sheet, totals["fund_increase"], styles["result_amount"]),
+                styled(sheet, totals["period_depreciation"], styles["result_amount"]),
+                company["yd_fis_sayisi"],
+                company["amortisman_fis_sayisi"],
+                "Tamam",
+            ]
+        )
+
+    sheet = workbook.create_sheet("Fiş Toplamları")
+    headers = ["Dosya", "Fiş", "Hesap Kodu", "Borç", "Alacak"]
+    for col, width in enumerate([32, 30, 14, 18, 18], start=1):
+        sheet.column_dimensions[get_column_letter(col)].width = width
+    sheet.freeze_panes = "A2"
+    sheet.append([styled(sheet, header, styles["result_header"]) for header in headers])
+    for company in companies:
+        if company["durum"] != "tamam":
+            continue
+        vouchers = VoucherAggregator(company["yd_fisleri"], company["amortisman_fisleri"])
+        for title, account_code, debit, credit in iter_voucher_lines(vouchers):
+            sheet.append(
+                [
+                    company["dosya"],
+                    title,
+                    account_code,
+                    styled(sheet, debit, styles["result_amount"]) if debit is not None else None,
+                    styled(sheet, credit, styles["result_amount"]) if credit is not None else None,
+                ]
+            )
+    workbook.save(output_path)
+
+
+def _rate_config(source: str | dict[str, Any] | None, reference: str | None) -> dict[str, Any] | None:
+    if not source:
+        return None
+    rates = read_rate_table(source, input_format(source)) if isinstance(source, str) else RateTable.from_config(source)
+    return (rates.with_reference(reference) if reference else rates).config()
+
+
+def _is_register(name: str) -> bool:
+    return not Path(name).name.startswith((".", "~$")) and input_format(name) is not None
+
+
+def _read_source(source: str, member: str | None, name: str) -> bytes:
+    if member is None:
+        return (Path(source) / name).read_bytes()
+    with zipfile.ZipFile(source) as archive:
+        return archive.read(member)
+
+
+def _input_key(content: bytes, settings: dict[str, Any]) -> str:
+    digest = hashlib.sha256(content)
+    digest.update(json.dumps(settings, sort_keys=True, ensure_ascii=False).encode())
+    digest.update(CALCULATOR_VERSION.encode())
+    return digest.hexdigest()
+
+
+def _output_names(names: list[str]) -> dict[str, str]:
+    stems = {name: Path(name).with_suffix("").as_posix().replace("/", "__") for name in names}
+    counts = Counter(stem.casefold() for stem in stems.values())
+    for name, stem in stems.items():
+        if counts[stem.casefold()] > 1:
+            stems[name] = f"{stem}_{Path(name).suffix.lstrip('.')}"
+    counts = Counter(stem.casefold() for stem in [*stems.values(), Path(STATE_FILE).stem, Path(SUMMARY_FILE).stem])
+    return {
+        name: f"{stem}_{hashlib.sha256(name.encode()).hexdigest()[:8]}" if counts[stem.casefold()] > 1 else stem
+        for name, stem in stems.items()
+    }
+
+
+def _write_state(path: Path, state: dict[str, Any]) -> None:
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bir klasördeki (veya zip) tüm sabit kıymet listelerini toplu hesaplar.")
+    parser.add_argument("girdi", help="Sabit kıymet listelerini içeren klasör veya zip dosyası.")
+    parser.add_argument("parametreler", help="islem_yili, donem, yd_orani (veya ufe_tablosu), format ve şirket bazlı ayarları içeren JSON dosyası.")
+    parser.add_argument("--output", default="toplu_sonuclar", help="Sonuçların yazılacağı klasör (varsayılan: toplu_sonuclar).")
+    parser.add_argument("--workers", type=int, default=None, help="Paralel süreç sayısı (varsayılan: işlemci sayısı).")
+    parser.add_argument("--engine", choices=("python", "numpy"), default="numpy", help="Hesaplama motoru.")
+    parser.add_argument("--force", action="store_true", help="Daha önce işlenen dosyaları da yeniden hesapla.")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_batch(args.girdi, load_parameters(args.parametreler), args.output, workers=args.workers, engine=args.engine, force=args.force)
+    except (OSError, ValueError) as exc:
+        print(f"hata: {exc}", file=sys.stderr)
+        return 2
+    print(json.dumps(report, ensure_ascii=False))
+    return 1 if report["hatali"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from openpyxl import Workbook
+
+import numpy as np
+
+from calculator import CALCULATOR_VERSION, KURUS, RESULT_TOTAL_FIELDS, calculate_assets, create_result_workbook, create_template, read_assets
+from engine import AssetTable, calculate_table
+
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_SEED = 20260101
+ISLEM_YILI = 2025
+DONEM = 4
+YD_ORANI = 25.49
+ACCOUNTS = tuple(str(code) for code in range(252, 268))
+VEHICLE_NAMES = ("BMW Araç", "Mercedes Binek", "Audi Otomobil", "Hizmet Aracı", "Kamyonet")
+ASSET_NAMES = ("CNC Makinesi", "Paketleme Hattı", "Ofis Mobilyaları", "Bilgisayar Donanımı", "Fabrika Binası", "Özel Maliyet", "Forklift", "Yazılım Lisansı")
+RATES = (0.02, 0.04, 0.1, 0.125, 0.2, 0.25, 0.3333, 0.5)
+HEADERS = [
+    "sabit kıymet",
+    "sabit kıymet açıklama",
+    "aktife giriş tarihi",
+    "amortisman oranı",
+    "amortisman yöntemi",
+    "defter son değeri",
+    "defter birikmiş amort",
+    "defter net değeri",
+    "binek",
+]
+EXCEL_EPOCH = date(1899, 12, 30)
+SAMPLE_REGISTER = Path(__file__).resolve().parent / "ornek_son_yil_binek_test.xlsx"
+EXACT_TOLERANCE_KURUS = 1
+
+
+def generate_register(path: str | Path, rows: int, seed: int = DEFAULT_SEED) -> Path:
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sabit Kıymetler")
+    sheet.append(HEADERS)
+    first_day = date(2000, 1, 1).toordinal()
+    last_day = date(ISLEM_YILI, 12, 31).toordinal()
+    for _ in range(rows):
+        account = rng.choice(ACCOUNTS)
+        vehicle = account == "254"
+        acquired = date.fromordinal(rng.randint(first_day, last_day))
+        rate = rng.choice(RATES)
+        cost = round(rng.uniform(1_000, 5_000_000), 2)
+        accumulated = round(cost * rng.uniform(0, 1) if acquired.year < ISLEM_YILI else 0.0, 2)
+        sheet.append(
+            [
+                int(account),
+                rng.choice(VEHICLE_NAMES if vehicle else ASSET_NAMES),
+                acquired.strftime("%d.%m.%Y") if rng.random() < 0.5 else (acquired - EXCEL_EPOCH).days,
+                rate,
+                "Azalan" if rng.random() < 0.15 else "Normal",
+                cost,
+                accumulated,
+                round(cost - accumulated, 2),
+                "E" if vehicle and rng.random() < 0.7 else "H",
+            ]
+        )
+    path = Path(path)
+    workbook.save(path)
+    return path
+
+
+def measure(fn: Callable[[], Any], memory: bool = True) -> tuple[Any, dict[str, float]]:
+    start = time.perf_counter()
+    result = fn()
+    stats = {"seconds": round(time.perf_counter() - start, 4)}
+    if memory:
+        del result
+        tracemalloc.start()
+        try:
+            result = fn()
+            stats["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+        finally:
+            tracemalloc.stop()
+    return result, stats
+
+
+def exact_parity(assets: list[Any]) -> dict[str, int]:
+    table = AssetTable.from_assets(assets)
+    floating = calculate_table(table, ISLEM_YILI, DONEM, YD_ORANI)
+    exact = calculate_table(table, ISLEM_YILI, DONEM, YD_ORANI, exact=True)
+    return {
+        name: int(np.abs(np.rint(floating[name] * KURUS).astype(np.int64) - exact.kurus[name]).max(initial=0))
+        for name in RESULT_TOTAL_FIELDS
+    }
+
+
+def run(sizes: list[int], seed: int = DEFAULT_SEED, memory: bool = True, workdir: str | Path | None = None) -> dict[str, Any]:
+    report: dict[str, Any] = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "calculator_version": CALCULATOR_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "parameters": {"islem_yili": ISLEM_YILI, "donem": DONEM, "yd_orani": YD_ORANI},
+        "results": [],
+        "exact_parity": [],
+    }
+    if SAMPLE_REGISTER.exists():
+        report["exact_parity"].append({"register": SAMPLE_REGISTER.name, "max_kurus_difference": exact_parity(read_assets(SAMPLE_REGISTER, max_rows=None))})
+    with tempfile.TemporaryDirectory(dir=workdir) as directory:
+        directory = Path(directory)
+        _, stats = measure(lambda: create_template(directory / "template.xlsx"), memory)
+        report["results"].append({"stage": "create_template", "rows": 0, **stats})
+
+        for rows in sizes:
+            register = generate_register(directory / f"register_{rows}.xlsx", rows, seed)
+            size_bytes = register.stat().st_size
+            stages: list[tuple[str, dict[str, float]]] = []
+            assets, stats = measure(lambda: read_assets(register, max_rows=None), memory)
+            stages.append(("read_assets", stats))
+            results, stats = measure(lambda: calculate_assets(assets, ISLEM_YILI, DONEM, YD_ORANI), memory)
+            stages.append(("calculate_assets", stats))
+            _, stats = measure(lambda: calculate_assets(assets, ISLEM_YILI, DONEM, YD_ORANI, engine="numpy"), memory)
+            stages.append(("calculate_assets[numpy]", stats))
+            report["exact_parity"].append({"register": register.name, "max_kurus_difference": exact_parity(assets)})
+            bytes_per_asset = calculate_table(AssetTable.from_assets(assets), ISLEM_YILI, DONEM, YD_ORANI).memory_per_asset
+            _, stats = measure(lambda: create_result_workbook(results, directory / "result.xlsx", ISLEM_YILI, DONEM, YD_ORANI), memory)
+            stages.append(("create_result_workbook", stats))
+            for stage, stats in stages:
+                entry = {"stage": stage, "rows": rows, **stats}
+                if stage == "read_assets":
+                    entry["input_bytes"] = size_bytes
+                if stage == "calculate_assets[numpy]":
+                    entry["bytes_per_asset"] = round(bytes_per_asset, 1)
+                report["results"].append(entry)
+    return report
+
+
+def compare(baseline: dict[str, Any], report: dict[str, Any]) -> list[dict[str, Any]]:
+    previous = {(entry["stage"], entry["rows"]): entry for entry in baseline["results"]}
+    rows = []
+    for entry in report["results"]:
+        before = previous.get((entry["stage"], entry["rows"]))
+        if before is None:
+            continue
+        row = {"stage": entry["stage"], "rows": entry["rows"], "speedup": round(before["seconds"] / max(entry["seconds"], 1e-9), 3)}
+        if "peak_mb" in entry and "peak_mb" in before:
+            row["peak_mb_change"] = round(entry["peak_mb"] - before["peak_mb"], 2)
+        rows.append(row)
+    return rows
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parent)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Sabit kıymet hesaplama hattı için performans ölçümü.")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Üretilecek kayıt sayıları (örn. 1000 10000 1000000).")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası (varsayılan: standart çıktı).")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc ile tepe bellek ölçümünü atla.")
+    parser.add_argument("--compare", metavar="JSON", help="Önceki bir ölçüm dosyası ile karşılaştır.")
+    parser.add_argument("--generate", metavar="PATH", help="Sadece örnek kayıt dosyası üret (ilk --rows değeri ile).")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        generate_register(args.generate, args.rows[0], args.seed)
+        return 0
+
+    report = run(args.rows, seed=args.seed, memory=not args.no_memory)
+    for entry in report["results"]:
+        peak = f"{entry['peak_mb']:>10.2f} MB" if "peak_mb" in entry else ""
+        print(f"{entry['stage']:<26} {entry['rows']:>9} satır {entry['seconds']:>10.4f} sn {peak}", file=sys.stderr)
+    mismatched = [entry["register"] for entry in report["exact_parity"] if max(entry["max_kurus_difference"].values()) > EXACT_TOLERANCE_KURUS]
+    for name in mismatched:
+        print(f"{name}: tam kuruş ve ondalık hesap {EXACT_TOLERANCE_KURUS} kuruştan fazla farklı.", file=sys.stderr)
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        report["compared_to"] = baseline.get("commit")
+        report["comparison"] = compare(baseline, report)
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
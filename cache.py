@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from io import BytesIO
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+from calculator import CALCULATOR_VERSION, period_end_month
+from storage import FileStore
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    output_path: Path
+    summary: dict[str, Any]
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class TemplateEntry:
+    content: bytes
+    etag: str
+    last_modified: datetime
+
+
+class ResultCache:
+    def __init__(self, store: FileStore, max_age_seconds: int) -> None:
+        self.store = store
+        self.max_age_seconds = max_age_seconds
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._by_file: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        snapshot_id: str, islem_yili: int, donem: int, yd_orani: float, profile: str = "", output_format: str = "xlsx", sheets: tuple[str, ...] = (), exact: bool = False, rates: str = ""
+    ) -> str:
+        period = {3: 1, 6: 2, 9: 3}.get(period_end_month(donem), 4)
+        parameters = f"{snapshot_id}|{islem_yili}|{period}|{round(yd_orani, 6)!r}|{profile}|{output_format}|{','.join(sorted(sheets))}|{'kurus' if exact else 'float'}|{rates}|{CALCULATOR_VERSION}"
+        return hashlib.sha256(parameters.encode()).hexdigest()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry.created_at > self.max_age_seconds or entry.output_path.name not in self.store:
+                self._remove(entry)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, output_path: Path, summary: dict[str, Any]) -> CacheEntry:
+        self.store.add(output_path)
+        entry = CacheEntry(key=key, output_path=output_path, summary=dict(summary))
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._by_file.pop(previous.output_path.name, None)
+            self._entries[key] = entry
+            self._by_file[output_path.name] = key
+            self._evict()
+        return entry
+
+    def etag(self, file_id: str) -> str | None:
+        with self._lock:
+            return self._by_file.get(file_id)
+
+    def _evict(self) -> None:
+        now = time.time()
+        for entry in [entry for entry in self._entries.values() if now - entry.created_at > self.max_age_seconds or entry.output_path.name not in self.store]:
+            self._remove(entry)
+
+    def _remove(self, entry: CacheEntry) -> None:
+        self._entries.pop(entry.key, None)
+        self._by_file.pop(entry.output_path.name, None)
+
+
+class TemplateCache:
+    def __init__(self, builders: dict[str, Callable[[BinaryIO], None]]) -> None:
+        self.builders = builders
+        self._entries: dict[str, TemplateEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, variant: str = "") -> TemplateEntry:
+        entry = self._entries.get(variant)
+        if entry is not None:
+            return entry
+        builder = self.builders[variant]
+        with self._lock:
+            entry = self._entries.get(variant)
+            if entry is None:
+                buffer = BytesIO()
+                builder(buffer)
+                content = buffer.getvalue()
+                entry = self._entries[variant] = TemplateEntry(
+                    content=content,
+                    etag=hashlib.sha256(content).hexdigest(),
+                    last_modified=datetime.now(timezone.utc).replace(microsecond=0),
+                )
+            return entry
@@ -1,17 +1,83 @@
 from __future__ import annotations
 
+import codecs
+import csv
+import hashlib
+import io
+import json
+import os
 import re
+import time
+import zipfile
+from bisect import bisect_right
+from collections import Counter
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterable, Iterator
 
 from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.cell import Cell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.fonts import DEFAULT_FONT
 from openpyxl.utils import get_column_letter
 
+if TYPE_CHECKING:
+    from engine import ResultTable
+
+
+CALCULATOR_VERSION = "2026.2"
+MAX_UPLOAD_ROWS = int(os.environ.get("MAX_UPLOAD_ROWS", "1000000"))
+HEADER_SCAN_ROWS = 10
+COLUMN_SAMPLE_ROWS = 200
+PROGRESS_INTERVAL = 1000
+INPUT_FORMATS = {
+    ".xlsx": "xlsx",
+    ".xlsm": "xlsx",
+    ".csv": "csv",
+    ".txt": "csv",
+    ".json": "json",
+    ".jsonl": "ndjson",
+    ".ndjson": "ndjson",
+    ".parquet": "parquet",
+}
+CSV_DELIMITERS = ";,\t|"
+CSV_SAMPLE_BYTES = 64 * 1024
+PARQUET_BATCH_ROWS = 4096
+
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill("solid", fgColor="4472C4")
+HEADER_ALIGNMENT = Alignment(horizontal="center", wrap_text=True)
+THIN_SIDE = Side(style="thin", color="B7B7B7")
+THIN_BORDER = Border(left=THIN_SIDE, right=THIN_SIDE, top=THIN_SIDE, bottom=THIN_SIDE)
+BOLD_FONT = Font(bold=True)
+
+TOTAL_COLUMNS = {
+    6: "maliyet",
+    7: "birikmis_amortisman",
+    8: "net_deger",
+    11: "revalued_cost",
+    12: "revalued_accumulated",
+    13: "revalued_net",
+    15: "annual_depreciation",
+    16: "period_depreciation",
+}
 
-MAX_UPLOAD_ROWS = 5000
+RESULT_STYLES = {
+    "result_title": {"font": Font(size=14, bold=True)},
+    "result_info": {"font": Font(size=11, bold=True)},
+    "result_header": {"font": HEADER_FONT, "fill": HEADER_FILL, "alignment": HEADER_ALIGNMENT},
+    "result_percent": {"font": DEFAULT_FONT, "number_format": "0.00%"},
+    "result_amount": {"font": DEFAULT_FONT, "number_format": "#,##0.00"},
+    "result_warning": {"font": Font(bold=True, color="9C0006"), "fill": PatternFill("solid", fgColor="FFC7CE")},
+    "result_bold": {"font": BOLD_FONT},
+    "result_total": {"font": BOLD_FONT, "number_format": "#,##0.00"},
+    "result_section": {"font": Font(size=12, bold=True, color="FFFFFF"), "fill": HEADER_FILL},
+    "result_voucher_header": {"font": HEADER_FONT, "fill": HEADER_FILL},
+}
 
 COLUMN_ALIASES = {
     "kiymet_no": ["sabit kıymet", "sabit kiymet", "kiymet no", "demirbaş no", "demirbas no", "sıra no", "no", "kod"],
@@ -45,14 +111,231 @@ class Asset:
     net_deger: float
 
 
+TURKISH_CHARACTERS = str.maketrans("çğıöşüİ", "cgiosui")
+NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+WHITESPACE = re.compile(r"\s+")
+PASSENGER_CAR_RULES = {
+    "hesaplar": ["254"],
+    "kelimeler": ["arac*", "otomobil*", "oto", "binek*", "bmw", "mercedes*", "audi"],
+}
+PASSENGER_CAR_MEMO_SIZE = 200_000
+ASSET_ROW_FIELDS = ("kiymet_no", "kiymet_ad", "aktif_hesap", "gider_hesap", "yontem", "maliyet", "amortisman_orani", "birikmis_amortisman", "net_deger")
+_UNMATCHED = object()
+KURUS = 100
+RATE_SCALE = 1_000_000
+INT64_MAX = 2**63 - 1
+PERIOD_PATTERN = re.compile(r"(?P<year>\d{4})(?:[-/.](?P<month>\d{1,2}))?|(?P<month2>\d{1,2})[-/.](?P<year2>\d{4})")
+MAIN_SHEETS = ("yd_amortisman", "muhasebe_fisleri")
+DETAIL_SHEETS = ("ozet", "kiymetler", "yeniden_degerleme", "amortisman", "yevmiye")
+RESULT_SHEETS = {
+    "yd_amortisman": "YD ve Amortisman",
+    "muhasebe_fisleri": "Muhasebe Fişleri",
+    "ozet": "Özet",
+    "kiymetler": "Sabit Kıymetler",
+    "yeniden_degerleme": "Yeniden Değerleme",
+    "amortisman": "Amortisman",
+    "yevmiye": "Kıymet Bazında Fişler",
+}
+
+DATE_FORMATS = {
+    "%d.%m.%Y": ("GG.AA.YYYY", re.compile(r"(?P<d>\d{1,2})\.(?P<m>\d{1,2})\.(?P<y>\d{4})")),
+    "%d/%m/%Y": ("GG/AA/YYYY", re.compile(r"(?P<d>\d{1,2})/(?P<m>\d{1,2})/(?P<y>\d{4})")),
+    "%Y-%m-%d": ("YYYY-AA-GG", re.compile(r"(?P<y>\d{4})-(?P<m>\d{1,2})-(?P<d>\d{1,2})")),
+    "%d-%m-%Y": ("GG-AA-YYYY", re.compile(r"(?P<d>\d{1,2})-(?P<m>\d{1,2})-(?P<y>\d{4})")),
+    "%d.%m.%y": ("GG.AA.YY", re.compile(r"(?P<d>\d{1,2})\.(?P<m>\d{1,2})\.(?P<y>\d{2})")),
+}
+NUMBER_FORMATS = {
+    "1234.56": re.compile(r"-?\d+(?:\.\d+)?"),
+    "1.234,56": re.compile(r"-?\d{1,3}(?:\.\d{3})+(?:,\d+)?|-?\d+(?:,\d+)?"),
+    "1,234.56": re.compile(r"-?\d{1,3}(?:,\d{3})+(?:\.\d+)?|-?\d+(?:\.\d+)?"),
+}
+COLUMN_TYPES = {
+    "tarih": "date",
+    "maliyet": "number",
+    "amortisman_orani": "number",
+    "omur": "integer",
+    "birikmis_amortisman": "number",
+    "net_deger": "number",
+}
+NATIVE_FORMAT = "excel"
+MIXED_FORMAT = "karma"
+
+ASSET_TOTAL_FIELDS = ("maliyet", "birikmis_amortisman", "net_deger")
+RESULT_TOTAL_FIELDS = (
+    "revalued_cost",
+    "revalued_accumulated",
+    "revalued_net",
+    "revaluation_increase",
+    "accumulated_increase",
+    "fund_increase",
+    "annual_depreciation",
+    "period_depreciation",
+)
+
+
+class VoucherAggregator:
+    def __init__(
+        self,
+        revaluation: dict[str, dict[str, float]] | None = None,
+        depreciation: dict[str, float] | None = None,
+        totals: dict[str, float] | None = None,
+        count: int = 0,
+        kurus: dict[str, Any] | None = None,
+    ) -> None:
+        self.revaluation = revaluation if revaluation is not None else {}
+        self.depreciation = depreciation if depreciation is not None else {}
+        self.totals = totals if totals is not None else dict.fromkeys(ASSET_TOTAL_FIELDS + RESULT_TOTAL_FIELDS, 0.0)
+        self.count = count
+        self.kurus = kurus
+
+    @classmethod
+    def from_results(cls, results: list[dict[str, Any]]) -> VoucherAggregator:
+        aggregator = cls()
+        for item in results:
+            aggregator.add(item)
+        return aggregator
+
+    @classmethod
+    def from_kurus(cls, kurus: dict[str, Any], count: int) -> VoucherAggregator:
+        aggregator = cls()
+        aggregator._merge_kurus(kurus, count)
+        return aggregator
+
+    def add(self, item: dict[str, Any]) -> None:
+        if "kurus" in item and (self.kurus is not None or not self.count):
+            self._merge_kurus(_kurus_vouchers(item["asset"].aktif_hesap, item["kurus"]), 1)
+            return
+        self.kurus = None
+        asset = item["asset"]
+        totals = self.totals
+        self.count += 1
+        totals["maliyet"] += asset.maliyet
+        totals["birikmis_amortisman"] += asset.birikmis_amortisman
+        totals["net_deger"] += asset.net_deger
+        for name in RESULT_TOTAL_FIELDS:
+            totals[name] += item[name]
+
+        if item["fund_increase"] > 0:
+            grouped = self.revaluation.get(asset.aktif_hesap)
+            if grouped is None:
+                grouped = self.revaluation[asset.aktif_hesap] = {"asset_increase": 0.0, "accumulated_increase": 0.0, "fund_increase": 0.0}
+            grouped["asset_increase"] += item["revaluation_increase"]
+            grouped["accumulated_increase"] += item["accumulated_increase"]
+            grouped["fund_increase"] += item["fund_increase"]
+        if item["period_depreciation"] > 0:
+            self.depreciation[asset.aktif_hesap] = self.depreciation.get(asset.aktif_hesap, 0.0) + item["period_depreciation"]
+
+    def merge(self, other: VoucherAggregator) -> None:
+        if other.kurus is not None and (self.kurus is not None or not self.count):
+            self._merge_kurus(other.kurus, other.count)
+            return
+        self.kurus = None
+        self.count += other.count
+        for name, value in other.totals.items():
+            self.totals[name] = self.totals.get(name, 0.0) + value
+        for account_code, values in other.revaluation.items():
+            grouped = self.revaluation.setdefault(account_code, dict.fromkeys(values, 0.0))
+            for name, value in values.items():
+                grouped[name] += value
+        for account_code, amount in other.depreciation.items():
+            self.depreciation[account_code] = self.depreciation.get(account_code, 0.0) + amount
+
+    def _merge_kurus(self, other: dict[str, Any], count: int) -> None:
+        if self.kurus is None:
+            self.kurus = {"totals": dict.fromkeys(ASSET_TOTAL_FIELDS + RESULT_TOTAL_FIELDS, 0), "revaluation": {}, "depreciation": {}}
+        kurus = self.kurus
+        self.count += count
+        for name, value in other["totals"].items():
+            kurus["totals"][name] += value
+            self.totals[name] = kurus["totals"][name] / KURUS
+        for account_code, values in other["revaluation"].items():
+            grouped = kurus["revaluation"].setdefault(account_code, dict.fromkeys(values, 0))
+            for name, value in values.items():
+                grouped[name] += value
+            self.revaluation[account_code] = {name: value / KURUS for name, value in grouped.items()}
+        for account_code, amount in other["depreciation"].items():
+            kurus["depreciation"][account_code] = kurus["depreciation"].get(account_code, 0) + amount
+            self.depreciation[account_code] = kurus["depreciation"][account_code] / KURUS
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "sabit_kiymet_sayisi": self.count,
+            "yd_fis_sayisi": len(self.revaluation),
+            "amortisman_fis_sayisi": len(self.depreciation),
+        }
+
+
+def _kurus_vouchers(account_code: str, amounts: dict[str, int]) -> dict[str, Any]:
+    revaluation = {}
+    if amounts["fund_increase"] > 0:
+        revaluation[account_code] = {
+            "asset_increase": amounts["revaluation_increase"],
+            "accumulated_increase": amounts["accumulated_increase"],
+            "fund_increase": amounts["fund_increase"],
+        }
+    depreciation = {account_code: amounts["period_depreciation"]} if amounts["period_depreciation"] > 0 else {}
+    return {"totals": {name: amounts[name] for name in ASSET_TOTAL_FIELDS + RESULT_TOTAL_FIELDS}, "revaluation": revaluation, "depreciation": depreciation}
+
+
+def to_kurus(value: float) -> int:
+    return round(value * KURUS)
+
+
+def scaled_rate(rate: float) -> int:
+    return round(rate * RATE_SCALE)
+
+
+def round_div(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(abs(numerator), denominator)
+    quotient += 2 * remainder >= denominator
+    return quotient if numerator >= 0 else -quotient
+
+
+def check_kurus_range(amount: int, factor: int, rate: int) -> None:
+    revalued = amount * (RATE_SCALE + abs(factor)) // RATE_SCALE + 1
+    if max(amount * abs(factor), revalued * max(rate, RATE_SCALE) * 2) > INT64_MAX:
+        raise ValueError("Tam kuruş hesabı için tutar veya oran çok büyük.")
+
+
+def kurus_amounts(asset: Asset, factor: int, active_months: int) -> dict[str, int]:
+    cost = to_kurus(asset.maliyet)
+    accumulated = to_kurus(asset.birikmis_amortisman)
+    net = to_kurus(asset.net_deger)
+    rate = scaled_rate(asset.amortisman_orani)
+    check_kurus_range(max(abs(cost), abs(accumulated), abs(net)), factor, abs(rate))
+    revaluation_increase = round_div(cost * factor, RATE_SCALE)
+    accumulated_increase = round_div(accumulated * factor, RATE_SCALE)
+    revalued_cost = cost + revaluation_increase
+    revalued_accumulated = accumulated + accumulated_increase
+    revalued_net = revalued_cost - revalued_accumulated
+    if active_months == 0 or revalued_net <= 0:
+        annual = 0
+    elif asset.yontem == "Azalan":
+        annual = min(round_div(revalued_net * rate * 2, RATE_SCALE), round_div(revalued_cost, 2))
+    else:
+        annual = round_div(revalued_cost * rate, RATE_SCALE)
+    return {
+        "maliyet": cost,
+        "birikmis_amortisman": accumulated,
+        "net_deger": net,
+        "revalued_cost": revalued_cost,
+        "revalued_accumulated": revalued_accumulated,
+        "revalued_net": revalued_net,
+        "revaluation_increase": revaluation_increase,
+        "accumulated_increase": accumulated_increase,
+        "fund_increase": round_div(net * factor, RATE_SCALE),
+        "annual_depreciation": annual,
+        "period_depreciation": round_div(annual * active_months, 12),
+    }
+
+
 def normalize(text: Any) -> str:
     if text is None:
         return ""
     value = str(text).lower().strip()
-    replacements = str.maketrans("çğıöşüİ", "cgiosui")
-    value = value.translate(replacements)
-    value = re.sub(r"[^a-z0-9]+", " ", value)
-    return re.sub(r"\s+", " ", value).strip()
+    value = value.translate(TURKISH_CHARACTERS)
+    value = NON_ALPHANUMERIC.sub(" ", value)
+    return WHITESPACE.sub(" ", value).strip()
 
 
 def find_column(headers: list[Any], aliases: list[str]) -> int | None:
@@ -67,11 +350,222 @@ def find_column(headers: list[Any], aliases: list[str]) -> int | None:
     return None
 
 
+class AliasIndex:
+    def __init__(self, aliases: dict[str, list[str]]) -> None:
+        self.fields: dict[str, tuple[str, ...]] = {}
+        for field, names in aliases.items():
+            normalized = (normalize(name) for name in names)
+            self.fields[field] = tuple(dict.fromkeys(normalized))
+
+    def extended(self, aliases: dict[str, list[str]]) -> AliasIndex:
+        merged = {field: list(names) for field, names in self.fields.items()}
+        for field, names in aliases.items():
+            merged[field] = list(names) + merged.get(field, [])
+        return AliasIndex(merged)
+
+    def match(self, headers: list[Any]) -> dict[str, int | None]:
+        normalized_headers = {normalize(header): idx for idx, header in enumerate(headers)}
+        keys = list(normalized_headers)
+        joined = "\n".join(keys)
+        starts = []
+        position = 0
+        for key in keys:
+            starts.append(position)
+            position += len(key) + 1
+
+        mapping: dict[str, int | None] = {}
+        for field, aliases in self.fields.items():
+            mapping[field] = None
+            for alias in aliases:
+                if alias in normalized_headers:
+                    mapping[field] = normalized_headers[alias]
+                    break
+                found = joined.find(alias) if alias else -1
+                if found >= 0:
+                    mapping[field] = normalized_headers[keys[bisect_right(starts, found) - 1]]
+                    break
+        return mapping
+
+    def score(self, headers: list[Any]) -> int:
+        return sum(1 for idx in self.match(headers).values() if idx is not None)
+
+
+DEFAULT_ALIAS_INDEX = AliasIndex(COLUMN_ALIASES)
+
+
+class PassengerCarRules:
+    def __init__(self, accounts: Iterable[str] = (), keywords: Iterable[str] = ()) -> None:
+        self.accounts = tuple(dict.fromkeys(str(account).strip() for account in accounts if str(account).strip()))
+        self.keywords = tuple(dict.fromkeys(keyword for keyword in (_keyword_rule(word) for word in keywords) if keyword))
+        self._exact_accounts = {account for account in self.accounts if not account.endswith("*")}
+        self._account_prefixes = tuple(account[:-1] for account in self.accounts if account.endswith("*"))
+        alternatives = [
+            f"(?P<k{index}>{re.escape(keyword.rstrip('*'))}{'[a-z0-9]*' if keyword.endswith('*') else ''})"
+            for index, keyword in enumerate(self.keywords)
+        ]
+        self._matcher = re.compile(r"(?<![a-z0-9])(?:" + "|".join(alternatives) + r")(?![a-z0-9])") if alternatives else None
+        self._labels = {f"k{index}": f"kelime:{keyword}" for index, keyword in enumerate(self.keywords)}
+        self._descriptions: dict[str, str | None] = {}
+        self.fingerprint = hashlib.sha256(json.dumps([self.accounts, self.keywords]).encode()).hexdigest()[:16]
+
+    @classmethod
+    def from_config(cls, config: dict[str, list[str]]) -> PassengerCarRules:
+        return cls(config.get("hesaplar", []), config.get("kelimeler", []))
+
+    def rule(self, asset: Asset) -> str | None:
+        if asset.binek:
+            return f"binek:{asset.binek}"
+        account = str(asset.aktif_hesap).strip()
+        if account in self._exact_accounts or (self._account_prefixes and account.startswith(self._account_prefixes)):
+            return f"hesap:{account}"
+        description = asset.kiymet_ad
+        label = self._descriptions.get(description, _UNMATCHED)
+        if label is not _UNMATCHED:
+            return label
+        match = self._matcher.search(normalize(description)) if self._matcher else None
+        label = self._labels[match.lastgroup] if match else None
+        if len(self._descriptions) >= PASSENGER_CAR_MEMO_SIZE:
+            self._descriptions.clear()
+        self._descriptions[description] = label
+        return label
+
+    def classify(self, asset: Asset, hits: Counter[str] | None = None) -> bool:
+        label = self.rule(asset)
+        if hits is not None:
+            hits[label or "eslesmedi"] += 1
+        return label is not None and label != "binek:H"
+
+
+def _keyword_rule(word: str) -> str:
+    wildcard = str(word).strip().endswith("*")
+    keyword = normalize(word)
+    return f"{keyword}*" if keyword and wildcard else keyword
+
+
+DEFAULT_PASSENGER_CAR_RULES = PassengerCarRules.from_config(PASSENGER_CAR_RULES)
+
+
+class RateTable:
+    def __init__(self, indices: Iterable[tuple[Any, float]], reference: Any = None) -> None:
+        points: dict[int, tuple[str, float]] = {}
+        for period, value in indices:
+            key, label = _period_key(period)
+            if key in points:
+                raise ValueError(f"ÜFE tablosunda aynı dönem birden fazla kez var: {label}")
+            if not value or value <= 0:
+                raise ValueError(f"ÜFE endeksi pozitif olmalıdır: {label}")
+            points[key] = (label, float(value))
+        if not points:
+            raise ValueError("ÜFE tablosu boş.")
+        ordered = sorted(points.items())
+        self.keys = tuple(key for key, _ in ordered)
+        self.labels = tuple(label for _, (label, _) in ordered)
+        self.values = tuple(value for _, (_, value) in ordered)
+        self.reference = _period_key(reference) if reference not in (None, "") else None
+        self.fingerprint = hashlib.sha256(json.dumps([self.labels, self.values, self.reference]).encode()).hexdigest()[:16]
+        self._rates: dict[int, tuple[str, tuple[float, ...]]] = {}
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any], reference: Any = None) -> RateTable:
+        indices = config["endeksler"] if "endeksler" in config else config
+        return cls(((period, parse_number(value)) for period, value in indices.items()), reference or config.get("referans"))
+
+    def config(self) -> dict[str, Any]:
+        return {"endeksler": dict(zip(self.labels, self.values)), "referans": self.reference[1] if self.reference else None}
+
+    def with_reference(self, reference: Any) -> RateTable:
+        return RateTable(zip(self.labels, self.values), reference)
+
+    def rates(self, islem_yili: int) -> tuple[str, tuple[float, ...]]:
+        cached = self._rates.get(islem_yili)
+        if cached is None:
+            reference_key = self.reference[0] if self.reference else islem_yili * 12 - 1
+            index = bisect_right(self.keys, reference_key) - 1
+            if index < 0:
+                raise ValueError(f"ÜFE tablosunda {islem_yili} öncesine ait endeks bulunamadı.")
+            reference_value = self.values[index]
+            label = self.reference[1] if self.reference else self.labels[index]
+            rates = tuple(max(round((reference_value / value - 1) * 100, 2), 0.0) for value in self.values)
+            cached = self._rates[islem_yili] = (label, rates)
+        return cached
+
+    def rate(self, tarih: datetime, islem_yili: int) -> float | None:
+        index = bisect_right(self.keys, tarih.year * 12 + tarih.month - 1) - 1
+        return self.rates(islem_yili)[1][index] if index >= 0 else None
+
+    def describe(self, islem_yili: int) -> str:
+        return f"ÜFE endeksi (referans {self.rates(islem_yili)[0]})"
+
+
+def _period_key(value: Any) -> tuple[int, str]:
+    if isinstance(value, (datetime, date)):
+        return value.year * 12 + value.month - 1, f"{value.year}-{value.month:02d}"
+    text = str(int(value) if isinstance(value, float) and value.is_integer() else value).strip()
+    match = PERIOD_PATTERN.fullmatch(text)
+    if not match:
+        raise ValueError(f"ÜFE dönemi anlaşılamadı: {text} (örn. 2024 veya 2024-11)")
+    year = int(match["year"] or match["year2"])
+    month = match["month"] or match["month2"]
+    if month is None:
+        return year * 12, str(year)
+    if not 1 <= int(month) <= 12:
+        raise ValueError(f"ÜFE dönemi anlaşılamadı: {text} (örn. 2024 veya 2024-11)")
+    return year * 12 + int(month) - 1, f"{year}-{int(month):02d}"
+
+
+def read_rate_table(source: str | Path | BinaryIO, file_format: str | None, reference: Any = None) -> RateTable:
+    try:
+        return _read_rate_table(source, file_format, reference)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise ValueError(f"ÜFE tablosu okunamadı: {exc}") from exc
+    except ValueError:
+        raise
+    except Exception as exc:
+        raise ValueError(f"ÜFE tablosu okunamadı: {exc}") from exc
+
+
+def _read_rate_table(source: str | Path | BinaryIO, file_format: str | None, reference: Any = None) -> RateTable:
+    if file_format == "json":
+        stream = source if hasattr(source, "read") else open(source, "rb")
+        try:
+            text = _text_stream(stream)
+            try:
+                data = json.load(text)
+            finally:
+                text.detach()
+        finally:
+            if stream is not source:
+                stream.close()
+        if isinstance(data, dict):
+            return RateTable.from_config(data, reference)
+        rows: Iterable[Any] = (tuple(item.values()) if isinstance(item, dict) else tuple(item) for item in data)
+        return RateTable(_rate_rows(rows), reference)
+    with _open_rows(source, file_format) as rows:
+        return RateTable(list(_rate_rows(rows)), reference)
+
+
+def _rate_rows(rows: Iterable[tuple[Any, ...]]) -> Iterator[tuple[Any, float]]:
+    started = False
+    for row_number, row in enumerate(rows, start=1):
+        cells = [cell for cell in row if cell not in (None, "")]
+        if not cells:
+            continue
+        value = parse_number(cells[1]) if len(cells) >= 2 else None
+        if value is None:
+            if started:
+                raise ValueError(f"ÜFE tablosu okunamadı: {row_number}. satırdaki endeks değeri sayı değil.")
+            continue
+        started = True
+        yield cells[0], value
+
+
 def parse_date(value: Any) -> datetime | None:
     if value in (None, ""):
         return None
     if isinstance(value, datetime):
         return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
     if isinstance(value, (int, float)):
         return datetime.fromordinal(datetime(1899, 12, 30).toordinal() + int(value))
     text = str(value).strip()
@@ -113,67 +607,325 @@ def parse_yontem(value: Any) -> str:
 
 def parse_binek(value: Any) -> str:
     if value in (None, ""):
-        return "H"
+        return ""
     text = normalize(value).upper()
     return "E" if text in {"E", "EVET", "YES", "Y", "1", "TRUE", "X"} else "H"
 
 
-def read_assets(path: str | Path) -> list[Asset]:
-    workbook = load_workbook(path, data_only=True)
-    worksheet = workbook.active
-    rows = list(worksheet.iter_rows(values_only=True))
-    if not rows:
-        raise ValueError("Excel dosyasında veri bulunamadı.")
+def _date_converter(fmt: str) -> Callable[[Any], datetime | None]:
+    pattern = DATE_FORMATS[fmt][1]
+    short_year = fmt.endswith("%y")
+
+    def convert(value: Any) -> datetime | None:
+        if isinstance(value, str):
+            match = pattern.fullmatch(value.strip())
+            if match:
+                year = int(match["y"])
+                if short_year:
+                    year += 2000 if year < 69 else 1900
+                try:
+                    return datetime(year, int(match["m"]), int(match["d"]))
+                except ValueError:
+                    pass
+        return parse_date(value)
+
+    return convert
+
+
+def _number_converter(fmt: str) -> Callable[[Any], float | None]:
+    pattern = NUMBER_FORMATS[fmt]
+    if fmt == "1.234,56":
+        def clean(text: str) -> str:
+            return text.replace(".", "").replace(",", ".")
+    elif fmt == "1,234.56":
+        def clean(text: str) -> str:
+            return text.replace(",", "")
+    else:
+        def clean(text: str) -> str:
+            return text
+
+    def convert(value: Any) -> float | None:
+        if isinstance(value, str):
+            text = value.strip()
+            if pattern.fullmatch(text):
+                return float(clean(text))
+        return parse_number(value)
+
+    return convert
+
+
+def _integer_converter(fmt: str) -> Callable[[Any], int | None]:
+    number = _number_converter(fmt)
+
+    def convert(value: Any) -> int | None:
+        result = number(value)
+        return int(result) if result else None
+
+    return convert
+
+
+DEFAULT_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "tarih": parse_date,
+    "maliyet": parse_number,
+    "amortisman_orani": parse_number,
+    "omur": parse_int,
+    "birikmis_amortisman": parse_number,
+    "net_deger": parse_number,
+}
+
+
+class ColumnFormats:
+    def __init__(self, rows: list[tuple[Any, ...]], mapping: dict[str, int | None]) -> None:
+        self.labels: dict[str, str] = {}
+        self.converters = dict(DEFAULT_CONVERTERS)
+        for field, kind in COLUMN_TYPES.items():
+            idx = mapping.get(field)
+            if idx is None:
+                continue
+            samples = [
+                row[idx].strip()
+                for row in rows
+                if idx < len(row) and isinstance(row[idx], str) and row[idx].strip()
+            ]
+            if kind == "date":
+                fmt = self._date_format(samples)
+                if fmt in DATE_FORMATS:
+                    self.converters[field] = _date_converter(fmt)
+                    self.labels[field] = DATE_FORMATS[fmt][0]
+                else:
+                    self.labels[field] = fmt
+            else:
+                fmt = self._number_format(samples)
+                if fmt in NUMBER_FORMATS:
+                    self.converters[field] = _integer_converter(fmt) if kind == "integer" else _number_converter(fmt)
+                self.labels[field] = fmt
+
+    @staticmethod
+    def _date_format(samples: list[str]) -> str:
+        if not samples:
+            return NATIVE_FORMAT
+        counts = {fmt: sum(1 for text in samples if pattern.fullmatch(text)) for fmt, (_, pattern) in DATE_FORMATS.items()}
+        best = max(counts, key=counts.get)
+        return best if counts[best] else MIXED_FORMAT
+
+    @staticmethod
+    def _number_format(samples: list[str]) -> str:
+        if not samples:
+            return NATIVE_FORMAT
+        comma_decimal = dot_decimal = 0
+        for text in samples:
+            comma = text.rfind(",")
+            dot = text.rfind(".")
+            if comma > dot or text.count(".") > 1:
+                comma_decimal += 1
+            elif comma >= 0:
+                dot_decimal += 1
+        if comma_decimal or dot_decimal:
+            return "1.234,56" if comma_decimal >= dot_decimal else "1,234.56"
+        return "1234.56"
+
+
+def read_assets(
+    path: str | Path | BinaryIO,
+    max_rows: int | None = MAX_UPLOAD_ROWS,
+    aliases: AliasIndex = DEFAULT_ALIAS_INDEX,
+    formats: dict[str, str] | None = None,
+    file_format: str | None = None,
+    counts: dict[str, int] | None = None,
+) -> list[Asset]:
+    return list(iter_assets(path, max_rows=max_rows, aliases=aliases, formats=formats, file_format=file_format, counts=counts))
+
+
+def iter_assets(
+    path: str | Path | BinaryIO,
+    max_rows: int | None = MAX_UPLOAD_ROWS,
+    aliases: AliasIndex = DEFAULT_ALIAS_INDEX,
+    formats: dict[str, str] | None = None,
+    file_format: str | None = None,
+    counts: dict[str, int] | None = None,
+) -> Iterator[Asset]:
+    if file_format is None:
+        file_format = input_format(path) if isinstance(path, (str, Path)) else "xlsx"
+    with _open_rows(path, file_format) as rows:
+        head = list(islice(rows, HEADER_SCAN_ROWS))
+        if not head:
+            raise ValueError("Dosyada veri bulunamadı.")
+
+        header_row_index = _detect_header_row(head, aliases)
+        mapping = _column_mapping(list(head[header_row_index]), aliases)
+        data = chain(head[header_row_index + 1 :], rows)
+        sample = list(islice(data, COLUMN_SAMPLE_ROWS))
+        columns = ColumnFormats(sample, mapping)
+        if formats is not None:
+            formats.update(columns.labels)
+
+        accepted = 0
+        data_rows = 0
+        for index, row in enumerate(chain(sample, data), start=1):
+            if not any(value not in (None, "") for value in row):
+                continue
+            data_rows += 1
+            if max_rows is not None and data_rows > max_rows:
+                raise ValueError(f"Dosyadaki satır sayısı üst sınırı aşıyor (en fazla {max_rows} satır).")
+            asset = _asset_from_row(row, mapping, index, columns.converters)
+            if asset:
+                accepted += 1
+                yield asset
+
+        if counts is not None:
+            counts.update(rows_read=data_rows, rows_accepted=accepted, rows_dropped=data_rows - accepted)
+        if not accepted:
+            raise ValueError("Hesaplanacak geçerli sabit kıymet satırı bulunamadı.")
+
+
+def input_format(filename: str | Path) -> str | None:
+    return INPUT_FORMATS.get(Path(filename).suffix.lower())
+
+
+@contextmanager
+def _open_rows(path: str | Path | BinaryIO, file_format: str | None) -> Iterator[Iterator[tuple[Any, ...]]]:
+    if file_format not in INPUT_FORMATS.values():
+        raise ValueError("Desteklenmeyen dosya biçimi.")
+    if file_format == "xlsx":
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            yield workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+        return
+
+    stream = path if hasattr(path, "read") else open(path, "rb")
+    try:
+        if file_format == "csv":
+            yield _csv_rows(stream)
+        elif file_format == "json":
+            yield _json_rows(stream)
+        elif file_format == "ndjson":
+            yield _ndjson_rows(stream)
+        else:
+            yield _parquet_rows(stream)
+    finally:
+        if stream is not path:
+            stream.close()
+
+
+def _text_stream(stream: BinaryIO) -> io.TextIOWrapper:
+    sample = stream.read(CSV_SAMPLE_BYTES)
+    stream.seek(0)
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError:
+        encoding = "cp1254"
+    return io.TextIOWrapper(stream, encoding=encoding, newline="")
+
+
+def _csv_rows(stream: BinaryIO) -> Iterator[tuple[Any, ...]]:
+    text = _text_stream(stream)
+    try:
+        sample = text.read(CSV_SAMPLE_BYTES)
+        text.seek(0)
+        try:
+            delimiter = csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS).delimiter
+        except csv.Error:
+            first_line = sample.splitlines()[0] if sample else ""
+            delimiter = max(CSV_DELIMITERS, key=first_line.count)
+        for row in csv.reader(text, delimiter=delimiter):
+            yield tuple(row)
+    finally:
+        text.detach()
+
+
+def _json_rows(stream: BinaryIO) -> Iterator[tuple[Any, ...]]:
+    text = _text_stream(stream)
+    try:
+        data = json.load(text)
+    finally:
+        text.detach()
+    if isinstance(data, dict):
+        data = next((value for value in data.values() if isinstance(value, list)), [])
+    if not data:
+        return
+    if not isinstance(data[0], dict):
+        yield from (tuple(row) for row in data)
+        return
+    headers = list(dict.fromkeys(key for item in data for key in item))
+    yield tuple(headers)
+    for item in data:
+        yield tuple(item.get(key) for key in headers)
+
+
+def _ndjson_rows(stream: BinaryIO) -> Iterator[tuple[Any, ...]]:
+    text = _text_stream(stream)
+    try:
+        headers: list[str] | None = None
+        for line in text:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if headers is None:
+                headers = list(item)
+                yield tuple(headers)
+            yield tuple(item.get(key) for key in headers)
+    finally:
+        text.detach()
+
+
+def _parquet_rows(stream: BinaryIO) -> Iterator[tuple[Any, ...]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ValueError("Parquet dosyaları için pyarrow paketi kurulmalıdır.") from exc
+
+    parquet_file = pq.ParquetFile(stream)
+    yield tuple(parquet_file.schema_arrow.names)
+    for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_ROWS):
+        yield from zip(*(column.to_pylist() for column in batch.columns))
 
-    header_row_index = _detect_header_row(rows)
-    headers = list(rows[header_row_index])
-    mapping = {field: find_column(headers, aliases) for field, aliases in COLUMN_ALIASES.items()}
+
+def _column_mapping(headers: list[Any], aliases: AliasIndex = DEFAULT_ALIAS_INDEX) -> dict[str, int | None]:
+    mapping = aliases.match(headers)
 
     missing = [field for field in ("kiymet_ad", "tarih", "maliyet") if mapping[field] is None]
     if mapping["omur"] is None and mapping["amortisman_orani"] is None:
         missing.append("omur/amortisman_orani")
     if missing:
         raise ValueError("Zorunlu kolonlar bulunamadı: " + ", ".join(missing))
+    return mapping
 
-    assets: list[Asset] = []
-    for index, row in enumerate(rows[header_row_index + 1 : header_row_index + 1 + MAX_UPLOAD_ROWS], start=1):
-        asset = _asset_from_row(row, mapping, index)
-        if asset:
-            assets.append(asset)
-
-    if not assets:
-        raise ValueError("Hesaplanacak geçerli sabit kıymet satırı bulunamadı.")
-    return assets
 
-
-def _detect_header_row(rows: list[tuple[Any, ...]]) -> int:
+def _detect_header_row(rows: list[tuple[Any, ...]], aliases: AliasIndex = DEFAULT_ALIAS_INDEX) -> int:
     best_index = 0
     best_score = -1
-    for idx, row in enumerate(rows[:10]):
-        headers = list(row)
-        score = sum(1 for aliases in COLUMN_ALIASES.values() if find_column(headers, aliases) is not None)
+    for idx, row in enumerate(rows[:HEADER_SCAN_ROWS]):
+        score = aliases.score(list(row))
         if score > best_score:
             best_index = idx
             best_score = score
     return best_index
 
 
-def _asset_from_row(row: tuple[Any, ...], mapping: dict[str, int | None], index: int) -> Asset | None:
+def _asset_from_row(
+    row: tuple[Any, ...],
+    mapping: dict[str, int | None],
+    index: int,
+    converters: dict[str, Callable[[Any], Any]] = DEFAULT_CONVERTERS,
+) -> Asset | None:
     def get(field: str, default: Any = None) -> Any:
         idx = mapping.get(field)
         return row[idx] if idx is not None and idx < len(row) else default
 
     name = get("kiymet_ad")
-    date = parse_date(get("tarih"))
-    cost = parse_number(get("maliyet"))
-    rate = parse_number(get("amortisman_orani"))
-    life = parse_int(get("omur"))
+    date = converters["tarih"](get("tarih"))
+    cost = converters["maliyet"](get("maliyet"))
+    rate = converters["amortisman_orani"](get("amortisman_orani"))
+    life = converters["omur"](get("omur"))
     if life is None and rate:
         life = max(round(1 / rate), 1)
     if not name or date is None or cost is None or life is None:
         return None
-    accumulated = parse_number(get("birikmis_amortisman")) or 0
-    net_value = parse_number(get("net_deger"))
+    accumulated = converters["birikmis_amortisman"](get("birikmis_amortisman")) or 0
+    net_value = converters["net_deger"](get("net_deger"))
     if net_value is None:
         net_value = cost - accumulated
     depreciation_rate = rate if rate else 1 / max(life, 1)
@@ -194,9 +946,32 @@ def _asset_from_row(row: tuple[Any, ...], mapping: dict[str, int | None], index:
     )
 
 
-def calculate_assets(assets: list[Asset], islem_yili: int, donem: int, yd_orani: float) -> list[dict[str, Any]]:
-    period_months = {1: 3, 2: 6, 3: 9, 4: 12}.get(donem, 12)
+def calculate_assets(
+    assets: list[Asset],
+    islem_yili: int,
+    donem: int,
+    yd_orani: float,
+    engine: str = "python",
+    aggregator: VoucherAggregator | None = None,
+    rules: PassengerCarRules = DEFAULT_PASSENGER_CAR_RULES,
+    hits: Counter[str] | None = None,
+    exact: bool = False,
+    rates: RateTable | None = None,
+    scenarios: Iterable[tuple[int, int, float]] | None = None,
+) -> list[dict[str, Any]]:
+    if scenarios is not None:
+        from engine import AssetTable, calculate_scenarios
+
+        return calculate_scenarios(AssetTable.from_assets(assets, rules, hits), scenarios)
+    if engine == "numpy":
+        from engine import calculate_assets_vectorized
+
+        return calculate_assets_vectorized(assets, islem_yili, donem, yd_orani, aggregator=aggregator, rules=rules, hits=hits, exact=exact, rates=rates)
+    if engine != "python":
+        raise ValueError(f"Bilinmeyen hesaplama motoru: {engine}")
+    period_months = period_end_month(donem)
     factor = yd_orani / 100
+    exact_factor = scaled_rate(factor)
     results = []
     for asset in assets:
         last_year = asset.tarih.year + asset.omur - 1
@@ -205,8 +980,15 @@ def calculate_assets(assets: list[Asset], islem_yili: int, donem: int, yd_orani:
             and asset.net_deger > 0
             and islem_yili <= last_year
         )
+        asset_rate = yd_orani
+        if rates is not None and eligible_for_revaluation:
+            asset_rate = rates.rate(asset.tarih, islem_yili)
+            if asset_rate is None:
+                raise ValueError(f"ÜFE tablosunda {asset.kiymet_no} kıymetinin edinim dönemi ({asset.tarih:%m.%Y}) için endeks bulunamadı.")
+            factor = asset_rate / 100
+            exact_factor = scaled_rate(factor)
         asset_factor = factor if eligible_for_revaluation else 0
-        is_passenger_car = _is_passenger_car(asset)
+        is_passenger_car = _is_passenger_car(asset, rules, hits)
         active_months = _active_months(asset.tarih, islem_yili, period_months, asset.omur, is_passenger_car)
         status = "Amortisman hakkı yok" if active_months == 0 else _asset_status(asset, islem_yili, is_passenger_car)
         revalued_cost = asset.maliyet * (1 + asset_factor)
@@ -217,29 +999,41 @@ def calculate_assets(assets: list[Asset], islem_yili: int, donem: int, yd_orani:
         fund_increase = asset.net_deger * asset_factor
         revalued_annual_depreciation = 0 if active_months == 0 else _annual_depreciation(asset, base=revalued_cost, net_base=revalued_net)
         revalued_period_depreciation = revalued_annual_depreciation * active_months / 12
-
-        results.append(
-            {
-                "asset": asset,
-                "eligible_for_revaluation": eligible_for_revaluation,
-                "is_passenger_car": is_passenger_car,
-                "active_months": active_months,
-                "status": status,
-                "yd_orani": yd_orani if eligible_for_revaluation else 0,
-                "revalued_cost": revalued_cost,
-                "revalued_accumulated": revalued_accumulated,
-                "revalued_net": revalued_net,
-                "revaluation_increase": revaluation_increase,
-                "accumulated_increase": accumulated_increase,
-                "fund_increase": fund_increase,
-                "annual_depreciation": revalued_annual_depreciation,
-                "period_depreciation": revalued_period_depreciation,
-                "revalued_period_depreciation": revalued_period_depreciation,
-            }
-        )
+        amounts = kurus_amounts(asset, exact_factor if eligible_for_revaluation else 0, active_months) if exact else None
+        if amounts:
+            revalued_cost, revalued_accumulated, revalued_net, revaluation_increase, accumulated_increase, fund_increase, revalued_annual_depreciation, revalued_period_depreciation = (
+                amounts[name] / KURUS for name in RESULT_TOTAL_FIELDS
+            )
+
+        item = {
+            "asset": asset,
+            "eligible_for_revaluation": eligible_for_revaluation,
+            "is_passenger_car": is_passenger_car,
+            "active_months": active_months,
+            "status": status,
+            "yd_orani": asset_rate if eligible_for_revaluation else 0,
+            "revalued_cost": revalued_cost,
+            "revalued_accumulated": revalued_accumulated,
+            "revalued_net": revalued_net,
+            "revaluation_increase": revaluation_increase,
+            "accumulated_increase": accumulated_increase,
+            "fund_increase": fund_increase,
+            "annual_depreciation": revalued_annual_depreciation,
+            "period_depreciation": revalued_period_depreciation,
+            "revalued_period_depreciation": revalued_period_depreciation,
+        }
+        if amounts:
+            item["kurus"] = amounts
+        if aggregator is not None:
+            aggregator.add(item)
+        results.append(item)
     return results
 
 
+def period_end_month(donem: int) -> int:
+    return {1: 3, 2: 6, 3: 9, 4: 12}.get(donem, 12)
+
+
 def _active_months(date: datetime, year: int, period_months: int, useful_life: int, is_passenger_car: bool) -> int:
     if date.year > year:
         return 0
@@ -252,12 +1046,8 @@ def _active_months(date: datetime, year: int, period_months: int, useful_life: i
     return period_months
 
 
-def _is_passenger_car(asset: Asset) -> bool:
-    if asset.binek == "E":
-        return True
-    account = str(asset.aktif_hesap).strip()
-    description = normalize(asset.kiymet_ad)
-    return account == "254" or any(word in description for word in ("arac", "oto", "otomobil", "binek", "bmw", "mercedes", "audi"))
+def _is_passenger_car(asset: Asset, rules: PassengerCarRules = DEFAULT_PASSENGER_CAR_RULES, hits: Counter[str] | None = None) -> bool:
+    return rules.classify(asset, hits)
 
 
 def _asset_status(asset: Asset, year: int, is_passenger_car: bool) -> str:
@@ -284,7 +1074,7 @@ def _annual_depreciation(asset: Asset, base: float | None = None, net_base: floa
     return normal
 
 
-def create_template(path: str | Path) -> None:
+def create_template(path: str | Path | BinaryIO) -> None:
     workbook = Workbook()
     sheet = workbook.active
     sheet.title = "Şablon"
@@ -321,60 +1111,169 @@ def create_template(path: str | Path) -> None:
     workbook.save(path)
 
 
-def create_result_workbook(results: list[dict[str, Any]], output_path: str | Path, islem_yili: int, donem: int, yd_orani: float) -> dict[str, int]:
-    workbook = Workbook()
-    main = workbook.active
-    main.title = "YD ve Amortisman"
-    _write_yd_amortisman_sheet(main, results, islem_yili, donem, yd_orani)
-    _write_accounting_vouchers_sheet(workbook.create_sheet("Muhasebe Fişleri"), results)
-    workbook.save(output_path)
-    return {
-        "sabit_kiymet_sayisi": len(results),
-        "yd_fis_sayisi": len(_group_revaluation_vouchers(results)),
-        "amortisman_fis_sayisi": len(_group_depreciation_vouchers(results)),
+def create_result_workbook(
+    results: list[dict[str, Any]] | ResultTable,
+    output_path: str | Path,
+    islem_yili: int,
+    donem: int,
+    yd_orani: float,
+    progress: Callable[[int], None] | None = None,
+    vouchers: VoucherAggregator | None = None,
+    sheets: Iterable[str] = (),
+    sheet_stats: dict[str, dict[str, float]] | None = None,
+    rates: RateTable | None = None,
+) -> dict[str, int]:
+    sheets = set(sheets)
+    unknown = sheets - set(DETAIL_SHEETS)
+    if unknown:
+        raise ValueError(f"Bilinmeyen sayfa: {', '.join(sorted(unknown))}")
+    if vouchers is None:
+        vouchers = result_vouchers(results)
+    workbook = Workbook(write_only=True)
+    styles = add_result_styles(workbook)
+    writers: dict[str, Callable[[Any], Any]] = {
+        "yd_amortisman": lambda sheet: _write_yd_amortisman_sheet(sheet, results, islem_yili, donem, yd_orani, styles, vouchers.totals, progress, rates),
+        "muhasebe_fisleri": lambda sheet: _write_accounting_vouchers_sheet(sheet, vouchers, styles),
+        "ozet": lambda sheet: _write_summary_sheet(sheet, vouchers, islem_yili, donem, yd_orani, styles, rates),
+        "kiymetler": lambda sheet: _write_assets_sheet(sheet, results, styles),
+        "yeniden_degerleme": lambda sheet: _write_revaluation_sheet(sheet, results, styles),
+        "amortisman": lambda sheet: _write_depreciation_sheet(sheet, results, styles),
+        "yevmiye": lambda sheet: _write_journal_sheet(sheet, results, styles),
     }
+    selected = [name for name in RESULT_SHEETS if name in MAIN_SHEETS or name in sheets]
+    durations = {}
+    for name in selected:
+        start = time.perf_counter()
+        writers[name](workbook.create_sheet(RESULT_SHEETS[name]))
+        durations[name] = time.perf_counter() - start
+    workbook.save(output_path)
+
+    if sheet_stats is not None:
+        if hasattr(output_path, "seek"):
+            output_path.seek(0)
+        with zipfile.ZipFile(output_path) as archive:
+            for index, name in enumerate(selected, start=1):
+                member = archive.getinfo(f"xl/worksheets/sheet{index}.xml")
+                sheet_stats[name] = {"sure": round(durations[name], 4), "bayt": member.compress_size}
+    return vouchers.summary()
+
 
+def _result_rows(results: list[dict[str, Any]] | ResultTable, names: tuple[str, ...]) -> Iterator[tuple[Any, ...]]:
+    if hasattr(results, "rows"):
+        return results.rows(names)
+    return (tuple(_item_value(item, name) for name in names) for item in results)
 
-def _write_title(sheet, title: str, columns: int) -> None:
-    sheet.cell(1, 1, title)
-    sheet.merge_cells(start_row=1, start_column=1, end_row=1, end_column=columns)
-    cell = sheet.cell(1, 1)
-    cell.font = Font(bold=True, color="FFFFFF", size=14)
-    cell.fill = PatternFill("solid", fgColor="1F4E78")
-    cell.alignment = Alignment(horizontal="center")
+
+def _item_value(item: dict[str, Any], name: str) -> Any:
+    if name == "giris_tarihi":
+        return item["asset"].tarih.strftime("%d.%m.%Y")
+    if name in ASSET_ROW_FIELDS:
+        return getattr(item["asset"], name)
+    return item[name]
+
+
+def result_vouchers(results: list[dict[str, Any]] | ResultTable) -> VoucherAggregator:
+    if hasattr(results, "vouchers"):
+        return results.vouchers
+    return VoucherAggregator.from_results(results)
+
+
+def create_scenario_workbook(summaries: list[dict[str, Any]], output_path: str | Path) -> None:
+    workbook = Workbook(write_only=True)
+    styles = add_result_styles(workbook)
+
+    sheet = workbook.create_sheet("Senaryo Karşılaştırma")
+    headers = ["İşlem Yılı", "Dönem", "YD Oranı", "Sabit Kıymet", "YD Kapsamında", "YD Artışı", "Birikmiş Amort. Artışı", "YD Fonu", "Dönem Amortismanı", "YD Fiş Sayısı", "Amortisman Fiş Sayısı"]
+    for col, width in enumerate([12, 12, 12, 14, 14, 18, 20, 18, 20, 14, 20], start=1):
+        sheet.column_dimensions[get_column_letter(col)].width = width
+    sheet.freeze_panes = "A2"
+    sheet.append([styled(sheet, header, styles["result_header"]) for header in headers])
+    for summary in summaries:
+        totals = summary["toplamlar"]
+        sheet.append(
+            [
+                summary["islem_yili"],
+                period_label(summary["donem"]),
+                styled(sheet, summary["yd_orani"] / 100, styles["result_percent"]),
+                summary["sabit_kiymet_sayisi"],
+                summary["yd_kapsaminda"],
+                styled(sheet, totals["revaluation_increase"], styles["result_amount"]),
+                styled(sheet, totals["accumulated_increase"], styles["result_amount"]),
+                styled(sheet, totals["fund_increase"], styles["result_amount"]),
+                styled(sheet, totals["period_depreciation"], styles["result_amount"]),
+                len(summary["yd_fisleri"]),
+                len(summary["amortisman_fisleri"]),
+            ]
+        )
+
+    sheet = workbook.create_sheet("Hesap Bazında")
+    headers = ["İşlem Yılı", "Dönem", "YD Oranı", "Hesap Kodu", "YD Artışı", "Birikmiş Amort. Artışı", "YD Fonu", "Dönem Amortismanı"]
+    for col, width in enumerate([12, 12, 12, 14, 18, 20, 18, 20], start=1):
+        sheet.column_dimensions[get_column_letter(col)].width = width
+    sheet.freeze_panes = "A2"
+    sheet.append([styled(sheet, header, styles["result_header"]) for header in headers])
+    for summary in summaries:
+        revaluation = summary["yd_fisleri"]
+        depreciation = summary["amortisman_fisleri"]
+        for account_code in list(revaluation) + [code for code in depreciation if code not in revaluation]:
+            totals = revaluation.get(account_code, {})
+            sheet.append(
+                [
+                    summary["islem_yili"],
+                    period_label(summary["donem"]),
+                    styled(sheet, summary["yd_orani"] / 100, styles["result_percent"]),
+                    _account_value(account_code),
+                    styled(sheet, totals.get("asset_increase", 0.0), styles["result_amount"]),
+                    styled(sheet, totals.get("accumulated_increase", 0.0), styles["result_amount"]),
+                    styled(sheet, totals.get("fund_increase", 0.0), styles["result_amount"]),
+                    styled(sheet, depreciation.get(account_code, 0.0), styles["result_amount"]),
+                ]
+            )
+    workbook.save(output_path)
 
 
 def _write_table(sheet, start_row: int, headers: list[str], rows: list[list[Any]]) -> None:
-    header_fill = PatternFill("solid", fgColor="4472C4")
-    thin = Side(style="thin", color="B7B7B7")
-    border = Border(left=thin, right=thin, top=thin, bottom=thin)
     for col, header in enumerate(headers, start=1):
         cell = sheet.cell(start_row, col, header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = header_fill
-        cell.border = border
-        cell.alignment = Alignment(horizontal="center", wrap_text=True)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.border = THIN_BORDER
+        cell.alignment = HEADER_ALIGNMENT
         sheet.column_dimensions[get_column_letter(col)].width = max(14, min(28, len(header) + 4))
     for row_idx, row in enumerate(rows, start=start_row + 1):
         for col_idx, value in enumerate(row, start=1):
             cell = sheet.cell(row_idx, col_idx, value)
-            cell.border = border
+            cell.border = THIN_BORDER
             if isinstance(value, datetime):
                 cell.number_format = "dd.mm.yyyy"
             if isinstance(value, (int, float)):
                 cell.number_format = "#,##0.00"
 
 
-def _write_yd_amortisman_sheet(sheet, results: list[dict[str, Any]], islem_yili: int, donem: int, yd_orani: float) -> None:
-    sheet.merge_cells("A1:Q1")
-    sheet["A1"] = "YENİDEN DEĞERLEME VE AMORTİSMAN TABLOSU"
-    sheet["A1"].font = Font(size=14, bold=True)
-    sheet["A2"] = f"İşlem Yılı: {islem_yili}"
-    sheet["A3"] = f"Dönem: {_period_label(donem)}"
-    sheet["A4"] = f"YD Oranı: %{yd_orani:.4f}"
-    for row in (2, 3, 4):
-        sheet.cell(row, 1).font = Font(size=11, bold=True)
+def add_result_styles(workbook: Workbook) -> dict[str, StyleArray]:
+    styles = {}
+    for name, attributes in RESULT_STYLES.items():
+        style = NamedStyle(name=name, **attributes)
+        workbook.add_named_style(style)
+        styles[name] = style.as_tuple()
+    return styles
+
 
+def styled(sheet, value: Any, style: StyleArray) -> Cell:
+    return Cell(sheet, row=1, column=1, value=value, style_array=style)
+
+
+def _write_yd_amortisman_sheet(
+    sheet,
+    results: list[dict[str, Any]] | ResultTable,
+    islem_yili: int,
+    donem: int,
+    yd_orani: float,
+    styles: dict[str, StyleArray],
+    totals: dict[str, float],
+    progress: Callable[[int], None] | None = None,
+    rates: RateTable | None = None,
+) -> None:
     headers = [
         "Sabit Kıymet",
         "Açıklama",
@@ -394,149 +1293,119 @@ def _write_yd_amortisman_sheet(sheet, results: list[dict[str, Any]], islem_yili:
         "YD Dönem Amortismanı",
         "Durum",
     ]
-    header_fill = PatternFill("solid", fgColor="4472C4")
-    for col, header in enumerate(headers, start=1):
-        cell = sheet.cell(6, col, header)
-        if header:
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal="center", wrap_text=True)
-
     widths = [12, 20, 15, 12, 15, 18, 18, 18, 2, 12, 18, 18, 18, 2, 18, 18, 18]
     for col, width in enumerate(widths, start=1):
         sheet.column_dimensions[get_column_letter(col)].width = width
-
-    for idx, item in enumerate(results, start=7):
-        asset = item["asset"]
-        values = [
-            asset.kiymet_no,
-            asset.kiymet_ad,
-            asset.tarih.strftime("%d.%m.%Y"),
-            asset.amortisman_orani,
-            "Hızlı" if asset.yontem == "Azalan" else "Normal",
-            asset.maliyet,
-            asset.birikmis_amortisman,
-            asset.net_deger,
+    sheet.freeze_panes = "A7"
+    sheet.merged_cells.add("A1:Q1")
+
+    sheet.append([styled(sheet, "YENİDEN DEĞERLEME VE AMORTİSMAN TABLOSU", styles["result_title"])])
+    sheet.append([styled(sheet, f"İşlem Yılı: {islem_yili}", styles["result_info"])])
+    sheet.append([styled(sheet, f"Dönem: {period_label(donem)}", styles["result_info"])])
+    rate_label = rates.describe(islem_yili) if rates else f"%{yd_orani:.4f}"
+    sheet.append([styled(sheet, f"YD Oranı: {rate_label}", styles["result_info"])])
+    sheet.append([])
+    sheet.append([styled(sheet, header, styles["result_header"]) if header else header for header in headers])
+
+    column_styles = {4: styles["result_percent"], 10: styles["result_percent"]}
+    column_styles.update({col: styles["result_amount"] for col in (6, 7, 8, 11, 12, 13, 15, 16)})
+    names = (
+        "kiymet_no", "kiymet_ad", "giris_tarihi", "amortisman_orani", "yontem", "maliyet", "birikmis_amortisman", "net_deger",
+        "yd_orani", "revalued_cost", "revalued_accumulated", "revalued_net", "annual_depreciation", "period_depreciation", "status",
+    )
+    count = 0
+    for kiymet_no, kiymet_ad, tarih, orani, yontem, maliyet, birikmis, net, yd, cost, accumulated, revalued_net, annual, period, status in _result_rows(results, names):
+        values: list[Any] = [
+            kiymet_no,
+            kiymet_ad,
+            tarih,
+            orani,
+            "Hızlı" if yontem == "Azalan" else "Normal",
+            maliyet,
+            birikmis,
+            net,
             None,
-            item["yd_orani"] / 100,
-            item["revalued_cost"],
-            item["revalued_accumulated"],
-            item["revalued_net"],
+            yd / 100,
+            cost,
+            accumulated,
+            revalued_net,
             None,
-            item["annual_depreciation"],
-            item["period_depreciation"],
-            item["status"],
+            annual,
+            period,
+            status,
         ]
-        for col, value in enumerate(values, start=1):
-            cell = sheet.cell(idx, col, value)
-            if col in (4, 10):
-                cell.number_format = "0.00%"
-            elif col in (6, 7, 8, 11, 12, 13, 15, 16):
-                cell.number_format = "#,##0.00"
-            elif col == 17 and value:
-                cell.font = Font(bold=True, color="9C0006")
-                cell.fill = PatternFill("solid", fgColor="FFC7CE")
-
-    total_row = 7 + len(results)
-    sheet.cell(total_row, 2, "TOPLAM").font = Font(bold=True)
-    for col in (6, 7, 8, 11, 12, 13, 15, 16):
-        letter = get_column_letter(col)
-        cell = sheet.cell(total_row, col, f"=SUM({letter}7:{letter}{total_row - 1})")
-        cell.font = Font(bold=True)
-        cell.number_format = "#,##0.00"
-
-    sheet.freeze_panes = "A7"
-
-
-def _write_accounting_vouchers_sheet(sheet, results: list[dict[str, Any]]) -> None:
-    sheet.merge_cells("A1:D1")
-    sheet["A1"] = "MUHASEBE FİŞLERİ"
-    sheet["A1"].font = Font(size=14, bold=True)
+        for col, style in column_styles.items():
+            values[col - 1] = styled(sheet, values[col - 1], style)
+        if values[16]:
+            values[16] = styled(sheet, values[16], styles["result_warning"])
+        sheet.append(values)
+        count += 1
+        if progress and count % PROGRESS_INTERVAL == 0:
+            progress(count)
+    if progress:
+        progress(count)
+
+    total_values: list[Any] = [None, styled(sheet, "TOPLAM", styles["result_bold"])] + [None] * 14
+    for col, name in TOTAL_COLUMNS.items():
+        total_values[col - 1] = styled(sheet, totals[name], styles["result_total"])
+    sheet.append(total_values)
+
+
+def _write_accounting_vouchers_sheet(sheet, vouchers: VoucherAggregator, styles: dict[str, StyleArray]) -> None:
     for col, width in enumerate([15, 30, 18, 18], start=1):
         sheet.column_dimensions[get_column_letter(col)].width = width
+    sheet.merged_cells.add("A1:D1")
+    sheet.append([styled(sheet, "MUHASEBE FİŞLERİ", styles["result_title"])])
+    sheet.append([])
 
     row = 3
-    row = _write_section_header(sheet, row, "YENİDEN DEĞERLEME FİŞLERİ")
-    for account_code, totals in _group_revaluation_vouchers(results).items():
-        row = _write_revaluation_voucher(sheet, row, account_code, totals)
-        row += 1
-
-    row += 1
-    row = _write_section_header(sheet, row, "AMORTİSMAN FİŞLERİ")
-    for account_code, amount in _group_depreciation_vouchers(results).items():
-        row = _write_depreciation_voucher(sheet, row, account_code, amount)
-        row += 1
-
-
-def _write_section_header(sheet, row: int, title: str) -> int:
-    sheet.merge_cells(start_row=row, start_column=1, end_row=row, end_column=4)
-    cell = sheet.cell(row, 1, title)
-    cell.font = Font(size=12, bold=True, color="FFFFFF")
-    cell.fill = PatternFill("solid", fgColor="4472C4")
+    row = _write_section_header(sheet, row, "YENİDEN DEĞERLEME FİŞLERİ", styles)
+    for account_code, totals in vouchers.revaluation.items():
+        row = _write_revaluation_voucher(sheet, row, account_code, totals, styles)
+        row = _write_blank_row(sheet, row)
+
+    row = _write_blank_row(sheet, row)
+    row = _write_section_header(sheet, row, "AMORTİSMAN FİŞLERİ", styles)
+    for account_code, amount in vouchers.depreciation.items():
+        row = _write_depreciation_voucher(sheet, row, account_code, amount, styles)
+        row = _write_blank_row(sheet, row)
+
+
+def _write_blank_row(sheet, row: int) -> int:
+    sheet.append([])
     return row + 1
 
 
-def _write_voucher_headers(sheet, row: int) -> None:
-    headers = ["Hesap Kodu", "Hesap Adı", "Borç", "Alacak"]
-    for col, header in enumerate(headers, start=1):
-        cell = sheet.cell(row, col, header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill("solid", fgColor="4472C4")
-
-
-def _write_revaluation_voucher(sheet, row: int, account_code: str, totals: dict[str, float]) -> int:
-    sheet.cell(row, 1, f"Yeniden Değerleme - {account_code}").font = Font(bold=True)
-    row += 1
-    _write_voucher_headers(sheet, row)
-    row += 1
-    sheet.cell(row, 1, _account_value(account_code))
-    sheet.cell(row, 3, totals["asset_increase"]).number_format = "#,##0.00"
-    row += 1
-    sheet.cell(row, 1, 257)
-    sheet.cell(row, 4, totals["accumulated_increase"]).number_format = "#,##0.00"
-    row += 1
-    sheet.cell(row, 1, 522)
-    sheet.cell(row, 4, totals["fund_increase"]).number_format = "#,##0.00"
+def _write_section_header(sheet, row: int, title: str, styles: dict[str, StyleArray]) -> int:
+    sheet.merged_cells.add(f"A{row}:D{row}")
+    sheet.append([styled(sheet, title, styles["result_section"])])
     return row + 1
 
 
-def _write_depreciation_voucher(sheet, row: int, account_code: str, amount: float) -> int:
-    sheet.cell(row, 1, f"Dönem Amortismanı - {account_code}").font = Font(bold=True)
-    row += 1
-    _write_voucher_headers(sheet, row)
-    row += 1
-    sheet.cell(row, 1, 770)
-    sheet.cell(row, 3, amount).number_format = "#,##0.00"
-    row += 1
-    sheet.cell(row, 1, 257)
-    sheet.cell(row, 4, amount).number_format = "#,##0.00"
+def _write_voucher_headers(sheet, row: int, styles: dict[str, StyleArray]) -> int:
+    headers = ["Hesap Kodu", "Hesap Adı", "Borç", "Alacak"]
+    sheet.append([styled(sheet, header, styles["result_voucher_header"]) for header in headers])
     return row + 1
 
 
-def _group_revaluation_vouchers(results: list[dict[str, Any]]) -> dict[str, dict[str, float]]:
-    grouped: dict[str, dict[str, float]] = {}
-    for item in results:
-        if item["fund_increase"] <= 0:
-            continue
-        account_code = str(item["asset"].aktif_hesap)
-        grouped.setdefault(account_code, {"asset_increase": 0.0, "accumulated_increase": 0.0, "fund_increase": 0.0})
-        grouped[account_code]["asset_increase"] += item["revaluation_increase"]
-        grouped[account_code]["accumulated_increase"] += item["accumulated_increase"]
-        grouped[account_code]["fund_increase"] += item["fund_increase"]
-    return grouped
-
-
-def _group_depreciation_vouchers(results: list[dict[str, Any]]) -> dict[str, float]:
-    grouped: dict[str, float] = {}
-    for item in results:
-        if item["period_depreciation"] <= 0:
-            continue
-        account_code = str(item["asset"].aktif_hesap)
-        grouped[account_code] = grouped.get(account_code, 0.0) + item["period_depreciation"]
-    return grouped
+def _write_revaluation_voucher(sheet, row: int, account_code: str, totals: dict[str, float], styles: dict[str, StyleArray]) -> int:
+    sheet.append([styled(sheet, f"Yeniden Değerleme - {account_code}", styles["result_bold"])])
+    row = _write_voucher_headers(sheet, row + 1, styles)
+    sheet.append([_account_value(account_code), None, styled(sheet, totals["asset_increase"], styles["result_amount"])])
+    sheet.append([257, None, None, styled(sheet, totals["accumulated_increase"], styles["result_amount"])])
+    sheet.append([522, None, None, styled(sheet, totals["fund_increase"], styles["result_amount"])])
+    return row + 3
+
 
+def _write_depreciation_voucher(sheet, row: int, account_code: str, amount: float, styles: dict[str, StyleArray]) -> int:
+    sheet.append([styled(sheet, f"Dönem Amortismanı - {account_code}", styles["result_bold"])])
+    row = _write_voucher_headers(sheet, row + 1, styles)
+    sheet.append([770, None, styled(sheet, amount, styles["result_amount"])])
+    sheet.append([257, None, None, styled(sheet, amount, styles["result_amount"])])
+    return row + 2
 
-def _period_label(donem: int) -> str:
+
+def period_label(donem: int) -> str:
     return {1: "1. Dönem", 2: "2. Dönem", 3: "3. Dönem", 4: "Yıllık"}.get(donem, "Yıllık")
 
 
@@ -547,57 +1416,95 @@ def _account_value(account_code: str) -> int | str:
         return account_code
 
 
-def _write_summary(sheet, results: list[dict[str, Any]], islem_yili: int, donem: int, yd_orani: float) -> None:
-    _write_title(sheet, "YENİDEN DEĞERLEME VE AMORTİSMAN ÖZETİ", 4)
-    rows = [
-        ["İşlem Yılı", islem_yili],
-        ["Dönem", {1: "1. Dönem", 2: "2. Dönem", 3: "3. Dönem", 4: "Yıllık"}.get(donem, "Yıllık")],
-        ["Yeniden Değerleme Oranı", yd_orani / 100],
-        ["Sabit Kıymet Sayısı", len(results)],
-        ["Toplam Maliyet", sum(item["asset"].maliyet for item in results)],
-        ["Toplam YD Artışı", sum(item["revaluation_increase"] for item in results)],
-        ["Dönem Amortismanı", sum(item["period_depreciation"] for item in results)],
-    ]
-    for row_idx, row in enumerate(rows, start=3):
-        sheet.cell(row_idx, 1, row[0]).font = Font(bold=True)
-        sheet.cell(row_idx, 2, row[1])
-        if row_idx in (5,):
-            sheet.cell(row_idx, 2).number_format = "0.00%"
-        if row_idx >= 7:
-            sheet.cell(row_idx, 2).number_format = "#,##0.00"
-    sheet.column_dimensions["A"].width = 28
-    sheet.column_dimensions["B"].width = 20
+def iter_journal_lines(results: list[dict[str, Any]] | ResultTable) -> Iterator[tuple[str, str, str, float | None, float | None, str]]:
+    names = ("kiymet_no", "kiymet_ad", "aktif_hesap", "gider_hesap", "revaluation_increase", "accumulated_increase", "fund_increase", "period_depreciation")
+    for kiymet_no, kiymet_ad, aktif_hesap, gider_hesap, increase, accumulated, fund, period in _result_rows(results, names):
+        if fund > 0:
+            description = f"{kiymet_ad} yeniden değerleme artışı"
+            yield "YD", kiymet_no, aktif_hesap, increase, None, description
+            yield "YD", kiymet_no, "257", None, accumulated, description
+            yield "YD", kiymet_no, "522", None, fund, description
+        if period > 0:
+            description = f"{kiymet_ad} dönem amortismanı"
+            yield "AMORT", kiymet_no, gider_hesap, period, None, description
+            yield "AMORT", kiymet_no, "257", None, period, description
 
 
-def _write_assets_sheet(sheet, results: list[dict[str, Any]]) -> None:
-    headers = ["sabit kıymet", "sabit kıymet açıklama", "aktife giriş tarihi", "amortisman oranı", "amortisman yöntemi", "defter son değeri", "defter birikmiş amort", "defter net değeri"]
-    rows = [[item["asset"].kiymet_no, item["asset"].kiymet_ad, item["asset"].tarih, item["asset"].amortisman_orani, item["asset"].yontem, item["asset"].maliyet, item["asset"].birikmis_amortisman, item["asset"].net_deger] for item in results]
-    _write_table(sheet, 1, headers, rows)
-    for row in range(2, len(rows) + 2):
-        sheet.cell(row, 4).number_format = "0.00%"
+def _write_detail_header(sheet, headers: list[str], widths: list[int], styles: dict[str, StyleArray]) -> None:
+    for col, width in enumerate(widths, start=1):
+        sheet.column_dimensions[get_column_letter(col)].width = width
+    sheet.freeze_panes = "A2"
+    sheet.append([styled(sheet, header, styles["result_header"]) for header in headers])
 
 
-def _write_revaluation_sheet(sheet, results: list[dict[str, Any]]) -> None:
-    headers = ["Kıymet No", "Kıymet Adı", "Eski Maliyet", "YD Oranı", "YD Artışı", "Yeni Değer"]
-    rows = [[item["asset"].kiymet_no, item["asset"].kiymet_ad, item["asset"].maliyet, item["yd_orani"] / 100, item["revaluation_increase"], item["revalued_cost"]] for item in results]
-    _write_table(sheet, 1, headers, rows)
-    for row in range(2, len(rows) + 2):
-        sheet.cell(row, 4).number_format = "0.00%"
+def _write_detail_rows(sheet, rows: Iterable[list[Any]], column_styles: dict[int, StyleArray]) -> int:
+    count = 0
+    for values in rows:
+        for col, style in column_styles.items():
+            if values[col - 1] is not None:
+                values[col - 1] = styled(sheet, values[col - 1], style)
+        sheet.append(values)
+        count += 1
+    return count
 
 
-def _write_depreciation_sheet(sheet, results: list[dict[str, Any]]) -> None:
-    headers = ["Kıymet No", "Kıymet Adı", "Aktif Ay", "Yıllık Amortisman", "Dönem Amortismanı", "YD Sonrası Dönem Amortismanı"]
-    rows = [[item["asset"].kiymet_no, item["asset"].kiymet_ad, item["active_months"], item["annual_depreciation"], item["period_depreciation"], item["revalued_period_depreciation"]] for item in results]
-    _write_table(sheet, 1, headers, rows)
+def _write_summary_sheet(
+    sheet, vouchers: VoucherAggregator, islem_yili: int, donem: int, yd_orani: float, styles: dict[str, StyleArray], rates: RateTable | None = None
+) -> int:
+    sheet.column_dimensions["A"].width = 28
+    sheet.column_dimensions["B"].width = 20
+    sheet.append([styled(sheet, "YENİDEN DEĞERLEME VE AMORTİSMAN ÖZETİ", styles["result_title"])])
+    sheet.append([])
+    totals = vouchers.totals
+    rows = [
+        ("İşlem Yılı", islem_yili, None),
+        ("Dönem", period_label(donem), None),
+        ("Yeniden Değerleme Oranı", rates.describe(islem_yili), None) if rates else ("Yeniden Değerleme Oranı", yd_orani / 100, styles["result_percent"]),
+        ("Sabit Kıymet Sayısı", vouchers.count, None),
+        ("Toplam Maliyet", totals["maliyet"], styles["result_amount"]),
+        ("Toplam YD Artışı", totals["revaluation_increase"], styles["result_amount"]),
+        ("YD Fonu", totals["fund_increase"], styles["result_amount"]),
+        ("Dönem Amortismanı", totals["period_depreciation"], styles["result_amount"]),
+        ("YD Fiş Sayısı", len(vouchers.revaluation), None),
+        ("Amortisman Fiş Sayısı", len(vouchers.depreciation), None),
+    ]
+    for label, value, style in rows:
+        sheet.append([styled(sheet, label, styles["result_bold"]), styled(sheet, value, style) if style else value])
+    return len(rows)
+
+
+def _write_assets_sheet(sheet, results: list[dict[str, Any]] | ResultTable, styles: dict[str, StyleArray]) -> int:
+    headers = ["Sabit Kıymet", "Açıklama", "Aktif Hesap", "Aktif Giriş Tarihi", "Amort. Oranı", "Amort. Yöntemi", "Defter Son Değeri", "Defter Birikmiş Amort.", "Defter Net Değeri"]
+    _write_detail_header(sheet, headers, [12, 24, 12, 15, 12, 15, 18, 18, 18], styles)
+    names = ("kiymet_no", "kiymet_ad", "aktif_hesap", "giris_tarihi", "amortisman_orani", "yontem", "maliyet", "birikmis_amortisman", "net_deger")
+    rows = (list(values) for values in _result_rows(results, names))
+    column_styles = {5: styles["result_percent"], 7: styles["result_amount"], 8: styles["result_amount"], 9: styles["result_amount"]}
+    return _write_detail_rows(sheet, rows, column_styles)
+
+
+def _write_revaluation_sheet(sheet, results: list[dict[str, Any]] | ResultTable, styles: dict[str, StyleArray]) -> int:
+    headers = ["Kıymet No", "Kıymet Adı", "Eski Maliyet", "YD Oranı", "YD Artışı", "Birikmiş Amort. Artışı", "YD Fonu", "Yeni Değer"]
+    _write_detail_header(sheet, headers, [12, 24, 18, 12, 18, 20, 18, 18], styles)
+    names = ("kiymet_no", "kiymet_ad", "maliyet", "yd_orani", "revaluation_increase", "accumulated_increase", "fund_increase", "revalued_cost")
+    rows = ([kiymet_no, kiymet_ad, maliyet, yd / 100, *amounts] for kiymet_no, kiymet_ad, maliyet, yd, *amounts in _result_rows(results, names))
+    column_styles = {col: styles["result_amount"] for col in (3, 5, 6, 7, 8)}
+    column_styles[4] = styles["result_percent"]
+    return _write_detail_rows(sheet, rows, column_styles)
+
+
+def _write_depreciation_sheet(sheet, results: list[dict[str, Any]] | ResultTable, styles: dict[str, StyleArray]) -> int:
+    headers = ["Kıymet No", "Kıymet Adı", "Aktif Ay", "Binek", "Yıllık Amortisman", "Dönem Amortismanı", "Durum"]
+    _write_detail_header(sheet, headers, [12, 24, 10, 8, 18, 18, 20], styles)
+    names = ("kiymet_no", "kiymet_ad", "active_months", "is_passenger_car", "annual_depreciation", "period_depreciation", "status")
+    rows = (
+        [kiymet_no, kiymet_ad, months, "E" if passenger else "H", annual, period, status]
+        for kiymet_no, kiymet_ad, months, passenger, annual, period, status in _result_rows(results, names)
+    )
+    return _write_detail_rows(sheet, rows, {5: styles["result_amount"], 6: styles["result_amount"]})
 
 
-def _write_journal_sheet(sheet, results: list[dict[str, Any]]) -> None:
-    headers = ["Fiş Tipi", "Kıymet No", "Borç Hesap", "Alacak Hesap", "Tutar", "Açıklama"]
-    rows: list[list[Any]] = []
-    for item in results:
-        asset = item["asset"]
-        if item["revaluation_increase"] > 0:
-            rows.append(["YD", asset.kiymet_no, asset.aktif_hesap, "522", item["revaluation_increase"], f"{asset.kiymet_ad} yeniden değerleme artışı"])
-        if item["period_depreciation"] > 0:
-            rows.append(["AMORT", asset.kiymet_no, asset.gider_hesap, "257", item["period_depreciation"], f"{asset.kiymet_ad} dönem amortismanı"])
-    _write_table(sheet, 1, headers, rows)
+def _write_journal_sheet(sheet, results: list[dict[str, Any]] | ResultTable, styles: dict[str, StyleArray]) -> int:
+    headers = ["Fiş Tipi", "Kıymet No", "Hesap Kodu", "Borç", "Alacak", "Açıklama"]
+    _write_detail_header(sheet, headers, [10, 12, 12, 18, 18, 40], styles)
+    rows = (list(line) for line in iter_journal_lines(results))
+    return _write_detail_rows(sheet, rows, {4: styles["result_amount"], 5: styles["result_amount"]})
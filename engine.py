@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+from calculator import (
+    ASSET_TOTAL_FIELDS,
+    DEFAULT_PASSENGER_CAR_RULES,
+    KURUS,
+    RATE_SCALE,
+    RESULT_TOTAL_FIELDS,
+    Asset,
+    PassengerCarRules,
+    RateTable,
+    VoucherAggregator,
+    check_kurus_range,
+    period_end_month,
+    scaled_rate,
+)
+
+
+STATUS_LABELS = ("", "Amortisman hakkı yok", "Son yıl dikkat", "Binek ilk yıl kıst", "Son yıl")
+STATUS_NONE, STATUS_NO_RIGHT, STATUS_LAST_YEAR_CAR, STATUS_FIRST_YEAR_CAR, STATUS_LAST_YEAR = range(len(STATUS_LABELS))
+ITER_CHUNK_ROWS = 4096
+BINEK_VALUES = ("", "E", "H")
+BINEK_CODES = {value: code for code, value in enumerate(BINEK_VALUES)}
+
+
+class StringPool:
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def find(self, value: str) -> int | None:
+        return self._codes.get(value)
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.values) + sys.getsizeof(self._codes) + sum(sys.getsizeof(value) for value in self.values)
+
+
+class AssetTable:
+    def __init__(
+        self,
+        kiymet_no: list[str],
+        kiymet_ad: list[str],
+        accounts: StringPool,
+        aktif_hesap: np.ndarray,
+        gider_hesap: np.ndarray,
+        year: np.ndarray,
+        month: np.ndarray,
+        day: np.ndarray,
+        maliyet: np.ndarray,
+        omur: np.ndarray,
+        azalan: np.ndarray,
+        binek: np.ndarray,
+        amortisman_orani: np.ndarray,
+        birikmis_amortisman: np.ndarray,
+        net_deger: np.ndarray,
+        passenger: np.ndarray,
+    ) -> None:
+        self.kiymet_no = kiymet_no
+        self.kiymet_ad = kiymet_ad
+        self.accounts = accounts
+        self.aktif_hesap = aktif_hesap
+        self.gider_hesap = gider_hesap
+        self.year = year
+        self.month = month
+        self.day = day
+        self.maliyet = maliyet
+        self.omur = omur
+        self.azalan = azalan
+        self.binek = binek
+        self.amortisman_orani = amortisman_orani
+        self.birikmis_amortisman = birikmis_amortisman
+        self.net_deger = net_deger
+        self.passenger = passenger
+
+    @classmethod
+    def from_assets(
+        cls, assets: Iterable[Asset], rules: PassengerCarRules = DEFAULT_PASSENGER_CAR_RULES, hits: Counter[str] | None = None
+    ) -> AssetTable:
+        kiymet_no: list[str] = []
+        kiymet_ad: list[str] = []
+        accounts = StringPool()
+        codes = {"aktif_hesap": "i", "gider_hesap": "i", "year": "i", "month": "b", "day": "b", "omur": "i", "azalan": "b", "binek": "b", "passenger": "b"}
+        numbers = ("maliyet", "amortisman_orani", "birikmis_amortisman", "net_deger")
+        buffers = {name: array(code) for name, code in codes.items()}
+        buffers.update({name: array("d") for name in numbers})
+        for asset in assets:
+            kiymet_no.append(asset.kiymet_no)
+            kiymet_ad.append(asset.kiymet_ad)
+            buffers["aktif_hesap"].append(accounts.code(asset.aktif_hesap))
+            buffers["gider_hesap"].append(accounts.code(asset.gider_hesap))
+            buffers["year"].append(asset.tarih.year)
+            buffers["month"].append(asset.tarih.month)
+            buffers["day"].append(asset.tarih.day)
+            buffers["omur"].append(asset.omur)
+            buffers["azalan"].append(asset.yontem == "Azalan")
+            buffers["binek"].append(BINEK_CODES.get(asset.binek, 0))
+            buffers["passenger"].append(rules.classify(asset, hits))
+            for name in numbers:
+                buffers[name].append(getattr(asset, name))
+
+        columns = {name: np.frombuffer(buffer, dtype=buffer.typecode).copy() for name, buffer in buffers.items()}
+        for name in ("azalan", "passenger"):
+            columns[name] = columns[name].astype(bool)
+        return cls(kiymet_no=kiymet_no, kiymet_ad=kiymet_ad, accounts=accounts, **columns)
+
+    def __len__(self) -> int:
+        return len(self.maliyet)
+
+    def asset(self, index: int) -> Asset:
+        return Asset(
+            kiymet_no=self.kiymet_no[index],
+            kiymet_ad=self.kiymet_ad[index],
+            aktif_hesap=self.accounts[self.aktif_hesap[index]],
+            gider_hesap=self.accounts[self.gider_hesap[index]],
+            tarih=datetime(int(self.year[index]), int(self.month[index]), int(self.day[index])),
+            maliyet=float(self.maliyet[index]),
+            omur=int(self.omur[index]),
+            yontem="Azalan" if self.azalan[index] else "Normal",
+            binek=BINEK_VALUES[self.binek[index]],
+            amortisman_orani=float(self.amortisman_orani[index]),
+            birikmis_amortisman=float(self.birikmis_amortisman[index]),
+            net_deger=float(self.net_deger[index]),
+        )
+
+    def __iter__(self) -> Iterator[Asset]:
+        for index in range(len(self)):
+            yield self.asset(index)
+
+    @property
+    def nbytes(self) -> int:
+        strings = sum(sys.getsizeof(value) for value in self.kiymet_no) + sum(sys.getsizeof(value) for value in self.kiymet_ad)
+        lists = sys.getsizeof(self.kiymet_no) + sys.getsizeof(self.kiymet_ad)
+        arrays = sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+        return strings + lists + arrays + self.accounts.nbytes
+
+
+class ResultTable:
+    def __init__(self, assets: AssetTable, columns: dict[str, np.ndarray], kurus: dict[str, np.ndarray] | None = None) -> None:
+        self.assets = assets
+        self.columns = columns
+        self.kurus = kurus
+        if kurus is not None:
+            exact = {
+                "totals": {name: int(kurus[name].sum()) for name in ASSET_TOTAL_FIELDS + RESULT_TOTAL_FIELDS},
+                "revaluation": self.revaluation_vouchers(kurus),
+                "depreciation": self.depreciation_vouchers(kurus),
+            }
+            self.vouchers = VoucherAggregator.from_kurus(exact, len(assets))
+            return
+        totals = {name: float(getattr(assets, name).sum()) for name in ASSET_TOTAL_FIELDS}
+        totals.update({name: float(columns[name].sum()) for name in RESULT_TOTAL_FIELDS})
+        self.vouchers = VoucherAggregator(self.revaluation_vouchers(), self.depreciation_vouchers(), totals, len(assets))
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        names = list(self.columns)
+        for start in range(0, len(self), ITER_CHUNK_ROWS):
+            stop = min(start + ITER_CHUNK_ROWS, len(self))
+            chunk = [self.columns[name][start:stop].tolist() for name in names]
+            for offset, values in enumerate(zip(*chunk)):
+                item: dict[str, Any] = {"asset": self.assets.asset(start + offset)}
+                item.update(zip(names, values))
+                item["status"] = STATUS_LABELS[item["status"]]
+                if self.kurus is not None:
+                    item["kurus"] = {name: int(values[start + offset]) for name, values in self.kurus.items()}
+                yield item
+
+    def rows(self, names: Iterable[str]) -> Iterator[tuple[Any, ...]]:
+        names = tuple(names)
+        for start in range(0, len(self), ITER_CHUNK_ROWS):
+            stop = min(start + ITER_CHUNK_ROWS, len(self))
+            yield from zip(*(self._row_values(name, start, stop) for name in names))
+
+    def _row_values(self, name: str, start: int, stop: int) -> list[Any]:
+        assets = self.assets
+        if name in ("kiymet_no", "kiymet_ad"):
+            return getattr(assets, name)[start:stop]
+        if name in ("aktif_hesap", "gider_hesap"):
+            accounts = assets.accounts.values
+            return [accounts[code] for code in getattr(assets, name)[start:stop].tolist()]
+        if name == "giris_tarihi":
+            dates = zip(assets.day[start:stop].tolist(), assets.month[start:stop].tolist(), assets.year[start:stop].tolist())
+            return [f"{day:02d}.{month:02d}.{year}" for day, month, year in dates]
+        if name == "yontem":
+            return ["Azalan" if azalan else "Normal" for azalan in assets.azalan[start:stop].tolist()]
+        if name in ("maliyet", "amortisman_orani", "birikmis_amortisman", "net_deger"):
+            return getattr(assets, name)[start:stop].tolist()
+        if name == "status":
+            return [STATUS_LABELS[code] for code in self.columns["status"][start:stop].tolist()]
+        return self.columns[name][start:stop].tolist()
+
+    def revaluation_vouchers(self, columns: dict[str, np.ndarray] | None = None) -> dict[str, dict[str, Any]]:
+        columns = self.columns if columns is None else columns
+        mask = columns["fund_increase"] > 0
+        sums = {
+            key: self._sum_by_account(columns[name], mask)
+            for key, name in (("asset_increase", "revaluation_increase"), ("accumulated_increase", "accumulated_increase"), ("fund_increase", "fund_increase"))
+        }
+        return {
+            self.assets.accounts[code]: {key: values[code].item() for key, values in sums.items()}
+            for code in self._accounts_in_order(mask)
+        }
+
+    def depreciation_vouchers(self, columns: dict[str, np.ndarray] | None = None) -> dict[str, Any]:
+        columns = self.columns if columns is None else columns
+        mask = columns["period_depreciation"] > 0
+        sums = self._sum_by_account(columns["period_depreciation"], mask)
+        return {self.assets.accounts[code]: sums[code].item() for code in self._accounts_in_order(mask)}
+
+    def _sum_by_account(self, values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        if values.dtype.kind != "i":
+            return np.bincount(self.assets.aktif_hesap[mask], weights=values[mask], minlength=len(self.assets.accounts))
+        sums = np.zeros(len(self.assets.accounts), dtype=np.int64)
+        np.add.at(sums, self.assets.aktif_hesap[mask], values[mask])
+        return sums
+
+    def _accounts_in_order(self, mask: np.ndarray) -> list[int]:
+        codes, first = np.unique(self.assets.aktif_hesap[mask], return_index=True)
+        return codes[np.argsort(first)].tolist()
+
+    @property
+    def nbytes(self) -> int:
+        return self.assets.nbytes + sum(value.nbytes for value in self.columns.values())
+
+    @property
+    def memory_per_asset(self) -> float:
+        return self.nbytes / max(len(self), 1)
+
+
+def active_months_array(table: AssetTable, islem_yili: int, period_months: int) -> np.ndarray:
+    year = table.year
+    month = table.month.astype(np.int32)
+    last_year = year + table.omur - 1
+    return np.where(
+        year > islem_yili,
+        0,
+        np.where(
+            year < islem_yili,
+            np.where(islem_yili > last_year, 0, period_months),
+            np.where(
+                month > period_months,
+                0,
+                np.where(table.passenger, period_months - month + 1, period_months),
+            ),
+        ),
+    ).astype(np.int8)
+
+
+def rate_array(table: AssetTable, rates: RateTable, islem_yili: int, eligible: np.ndarray) -> np.ndarray:
+    values = np.asarray(rates.rates(islem_yili)[1])
+    index = np.searchsorted(np.asarray(rates.keys), table.year * 12 + table.month.astype(np.int32) - 1, side="right") - 1
+    missing = np.flatnonzero(eligible & (index < 0))
+    if len(missing):
+        row = int(missing[0])
+        raise ValueError(f"ÜFE tablosunda {table.kiymet_no[row]} kıymetinin edinim dönemi ({table.month[row]:02d}.{table.year[row]}) için endeks bulunamadı.")
+    return np.where(eligible, values[np.maximum(index, 0)], 0.0)
+
+
+def calculate_columns(table: AssetTable, islem_yili: int, donem: int, yd_orani: float, rates: RateTable | None = None) -> dict[str, np.ndarray]:
+    period_months = period_end_month(donem)
+    factor = yd_orani / 100
+    year = table.year
+    last_year = year + table.omur - 1
+
+    eligible = (year < islem_yili) & (table.net_deger > 0) & (islem_yili <= last_year)
+    asset_rate = np.where(eligible, yd_orani, 0.0) if rates is None else rate_array(table, rates, islem_yili, eligible)
+    asset_factor = np.where(eligible, factor, 0.0) if rates is None else asset_rate / 100
+
+    active_months = active_months_array(table, islem_yili, period_months)
+
+    status = np.select(
+        [
+            active_months == 0,
+            islem_yili > last_year,
+            table.passenger & (islem_yili == last_year),
+            table.passenger & (islem_yili == year),
+            ~table.passenger & (islem_yili == last_year),
+        ],
+        [STATUS_NO_RIGHT, STATUS_NO_RIGHT, STATUS_LAST_YEAR_CAR, STATUS_FIRST_YEAR_CAR, STATUS_LAST_YEAR],
+        default=STATUS_NONE,
+    ).astype(np.int8)
+
+    revalued_cost = table.maliyet * (1 + asset_factor)
+    revalued_accumulated = table.birikmis_amortisman * (1 + asset_factor)
+    revalued_net = revalued_cost - revalued_accumulated
+    rate = table.amortisman_orani
+    annual = np.where(
+        table.azalan,
+        np.minimum(revalued_net * rate * 2, revalued_cost * 0.5),
+        revalued_cost * rate,
+    )
+    annual = np.where((active_months == 0) | (revalued_net <= 0), 0.0, annual)
+    period_depreciation = annual * active_months / 12
+
+    return {
+        "eligible_for_revaluation": eligible,
+        "is_passenger_car": table.passenger,
+        "active_months": active_months,
+        "status": status,
+        "yd_orani": asset_rate,
+        "revalued_cost": revalued_cost,
+        "revalued_accumulated": revalued_accumulated,
+        "revalued_net": revalued_net,
+        "revaluation_increase": table.maliyet * asset_factor,
+        "accumulated_increase": table.birikmis_amortisman * asset_factor,
+        "fund_increase": table.net_deger * asset_factor,
+        "annual_depreciation": annual,
+        "period_depreciation": period_depreciation,
+        "revalued_period_depreciation": period_depreciation,
+    }
+
+
+def round_div_array(numerator: np.ndarray, denominator: int) -> np.ndarray:
+    quotient, remainder = np.divmod(np.abs(numerator), denominator)
+    quotient += 2 * remainder >= denominator
+    return np.where(numerator < 0, -quotient, quotient)
+
+
+def kurus_columns(table: AssetTable, eligible: np.ndarray, active_months: np.ndarray, factor: int | np.ndarray) -> dict[str, np.ndarray]:
+    cost = np.rint(table.maliyet * KURUS).astype(np.int64)
+    accumulated = np.rint(table.birikmis_amortisman * KURUS).astype(np.int64)
+    net = np.rint(table.net_deger * KURUS).astype(np.int64)
+    rate = np.rint(table.amortisman_orani * RATE_SCALE).astype(np.int64)
+    if len(table):
+        check_kurus_range(int(max(np.abs(cost).max(), np.abs(accumulated).max(), np.abs(net).max())), int(np.abs(factor).max()), int(np.abs(rate).max()))
+    asset_factor = np.where(eligible, factor, 0)
+    revaluation_increase = round_div_array(cost * asset_factor, RATE_SCALE)
+    accumulated_increase = round_div_array(accumulated * asset_factor, RATE_SCALE)
+    revalued_cost = cost + revaluation_increase
+    revalued_accumulated = accumulated + accumulated_increase
+    revalued_net = revalued_cost - revalued_accumulated
+    annual = np.where(
+        table.azalan,
+        np.minimum(round_div_array(revalued_net * rate * 2, RATE_SCALE), round_div_array(revalued_cost, 2)),
+        round_div_array(revalued_cost * rate, RATE_SCALE),
+    )
+    months = active_months.astype(np.int64)
+    annual = np.where((months == 0) | (revalued_net <= 0), 0, annual)
+    return {
+        "maliyet": cost,
+        "birikmis_amortisman": accumulated,
+        "net_deger": net,
+        "revalued_cost": revalued_cost,
+        "revalued_accumulated": revalued_accumulated,
+        "revalued_net": revalued_net,
+        "revaluation_increase": revaluation_increase,
+        "accumulated_increase": accumulated_increase,
+        "fund_increase": round_div_array(net * asset_factor, RATE_SCALE),
+        "annual_depreciation": annual,
+        "period_depreciation": round_div_array(annual * months, 12),
+    }
+
+
+def calculate_table(
+    table: AssetTable, islem_yili: int, donem: int, yd_orani: float, exact: bool = False, rates: RateTable | None = None
+) -> ResultTable:
+    columns = calculate_columns(table, islem_yili, donem, yd_orani, rates)
+    if not exact:
+        return ResultTable(table, columns)
+    factor = scaled_rate(yd_orani / 100) if rates is None else np.rint(columns["yd_orani"] / 100 * RATE_SCALE).astype(np.int64)
+    kurus = kurus_columns(table, columns["eligible_for_revaluation"], columns["active_months"], factor)
+    columns.update({name: kurus[name] / KURUS for name in RESULT_TOTAL_FIELDS})
+    columns["revalued_period_depreciation"] = columns["period_depreciation"]
+    return ResultTable(table, columns, kurus)
+
+
+def iter_result_chunks(
+    assets: Iterable[Asset],
+    islem_yili: int,
+    donem: int,
+    yd_orani: float,
+    chunk_rows: int = ITER_CHUNK_ROWS,
+    rules: PassengerCarRules = DEFAULT_PASSENGER_CAR_RULES,
+    exact: bool = False,
+    rates: RateTable | None = None,
+) -> Iterator[tuple[list[Asset], ResultTable]]:
+    iterator = iter(assets)
+    while chunk := list(islice(iterator, chunk_rows)):
+        yield chunk, calculate_table(AssetTable.from_assets(chunk, rules), islem_yili, donem, yd_orani, exact, rates)
+
+
+def summarize(results: ResultTable) -> dict[str, Any]:
+    return {
+        "sabit_kiymet_sayisi": len(results),
+        "yd_kapsaminda": int(results["eligible_for_revaluation"].sum()),
+        "toplamlar": dict(results.vouchers.totals),
+        "yd_fisleri": results.vouchers.revaluation,
+        "amortisman_fisleri": results.vouchers.depreciation,
+    }
+
+
+def calculate_scenarios(table: AssetTable, scenarios: Iterable[tuple[int, int, float]]) -> list[dict[str, Any]]:
+    summaries = []
+    for islem_yili, donem, yd_orani in scenarios:
+        summary = summarize(calculate_table(table, islem_yili, donem, yd_orani))
+        summaries.append({"islem_yili": islem_yili, "donem": donem, "yd_orani": yd_orani, **summary})
+    return summaries
+
+
+def calculate_assets_vectorized(
+    assets: list[Asset],
+    islem_yili: int,
+    donem: int,
+    yd_orani: float,
+    aggregator: VoucherAggregator | None = None,
+    rules: PassengerCarRules = DEFAULT_PASSENGER_CAR_RULES,
+    hits: Counter[str] | None = None,
+    exact: bool = False,
+    rates: RateTable | None = None,
+) -> list[dict[str, Any]]:
+    results = calculate_table(AssetTable.from_assets(assets, rules, hits), islem_yili, donem, yd_orani, exact, rates)
+    if aggregator is not None:
+        aggregator.merge(results.vouchers)
+    return [dict(item, asset=asset) for asset, item in zip(assets, results)]
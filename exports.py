@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import calendar
+import codecs
+import csv
+import io
+import json
+import zipfile
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+import numpy as np
+
+from calculator import Asset, RateTable, VoucherAggregator, create_result_workbook, period_end_month, result_vouchers
+from engine import STATUS_LABELS, AssetTable, ResultTable
+
+
+OUTPUT_FORMATS = {
+    "xlsx": ".xlsx",
+    "csv": ".csv.zip",
+    "json": ".json",
+    "parquet": ".parquet.zip",
+}
+RESULT_COLUMNS = {
+    "kiymet_no": "Sabit Kıymet",
+    "kiymet_ad": "Açıklama",
+    "aktif_hesap": "Aktif Hesap",
+    "tarih": "Aktif Giriş Tarihi",
+    "amortisman_orani": "Amort. Oranı",
+    "yontem": "Amort. Yöntemi",
+    "maliyet": "Defter Son Değeri",
+    "birikmis_amortisman": "Defter Birikmiş Amort.",
+    "net_deger": "Defter Net Değeri",
+    "yd_orani": "YD Oranı",
+    "revalued_cost": "YD Sabit Kıymet",
+    "revalued_accumulated": "YD Birikmiş Amort.",
+    "revalued_net": "YD Net Değer",
+    "annual_depreciation": "YD Yıllık Amortisman",
+    "period_depreciation": "YD Dönem Amortismanı",
+    "status": "Durum",
+}
+VOUCHER_COLUMNS = {
+    "fis": "Fiş",
+    "hesap_kodu": "Hesap Kodu",
+    "borc": "Borç",
+    "alacak": "Alacak",
+}
+JOURNAL_COLUMNS = {
+    "fis_no": "Fiş No",
+    "tarih": "Tarih",
+    "fis_turu": "Fiş Türü",
+    "hesap_kodu": "Hesap Kodu",
+    "kiymet_no": "Kıymet No",
+    "aciklama": "Açıklama",
+    "borc": "Borç",
+    "alacak": "Alacak",
+}
+JOURNAL_WIDTHS = {"fis_no": 6, "tarih": 10, "fis_turu": 5, "hesap_kodu": 12, "kiymet_no": 20, "aciklama": 50, "borc": 18, "alacak": 18}
+JOURNAL_FORMATS = {"csv": (".csv", "text/csv"), "sabit": (".txt", "text/plain")}
+JOURNAL_ENCODINGS = {"utf-8": "utf-8-sig", "cp1254": "cp1254"}
+JOURNAL_DELIMITERS = {";": ";", ",": ",", "tab": "\t", "|": "|"}
+JOURNAL_AMOUNTS = ("borc", "alacak")
+JOURNAL_TRUNCATED = ("aciklama",)
+JOURNAL_CHUNK_LINES = 1000
+ASSET_COLUMNS = ("kiymet_no", "kiymet_ad", "aktif_hesap", "tarih", "amortisman_orani", "yontem", "maliyet", "birikmis_amortisman", "net_deger")
+
+
+def result_columns(results: list[dict[str, Any]] | ResultTable) -> dict[str, list[Any]]:
+    if isinstance(results, ResultTable):
+        assets = results.assets
+        columns: dict[str, list[Any]] = {
+            "kiymet_no": assets.kiymet_no,
+            "kiymet_ad": assets.kiymet_ad,
+            "aktif_hesap": [assets.accounts[code] for code in assets.aktif_hesap.tolist()],
+            "tarih": [date(year, month, day) for year, month, day in zip(assets.year.tolist(), assets.month.tolist(), assets.day.tolist())],
+            "amortisman_orani": assets.amortisman_orani.tolist(),
+            "yontem": ["Azalan" if azalan else "Normal" for azalan in assets.azalan.tolist()],
+            "maliyet": assets.maliyet.tolist(),
+            "birikmis_amortisman": assets.birikmis_amortisman.tolist(),
+            "net_deger": assets.net_deger.tolist(),
+        }
+        columns.update({name: results[name].tolist() for name in RESULT_COLUMNS if name not in columns and name != "status"})
+        columns["status"] = [STATUS_LABELS[code] for code in results["status"].tolist()]
+        return columns
+
+    columns = {name: [] for name in RESULT_COLUMNS}
+    for item in results:
+        asset = item["asset"]
+        for name in ASSET_COLUMNS:
+            columns[name].append(getattr(asset, name))
+        for name in RESULT_COLUMNS:
+            if name not in ASSET_COLUMNS:
+                columns[name].append(item[name])
+    columns["tarih"] = [value.date() for value in columns["tarih"]]
+    return columns
+
+
+def iter_voucher_lines(vouchers: VoucherAggregator) -> Iterator[tuple[str, str, float | None, float | None]]:
+    for account_code, totals in vouchers.revaluation.items():
+        title = f"Yeniden Değerleme - {account_code}"
+        yield title, account_code, totals["asset_increase"], None
+        yield title, "257", None, totals["accumulated_increase"]
+        yield title, "522", None, totals["fund_increase"]
+    for account_code, amount in vouchers.depreciation.items():
+        title = f"Dönem Amortismanı - {account_code}"
+        yield title, "770", amount, None
+        yield title, "257", None, amount
+
+
+@dataclass
+class JournalLayout:
+    output_format: str = "csv"
+    fields: tuple[str, ...] = tuple(JOURNAL_COLUMNS)
+    widths: tuple[int, ...] = tuple(JOURNAL_WIDTHS.values())
+    delimiter: str = ";"
+    decimal: str = ","
+    encoding: str = "utf-8-sig"
+    header: bool = True
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, str]) -> JournalLayout:
+        output_format = options.get("format", "csv")
+        if output_format not in JOURNAL_FORMATS:
+            raise ValueError(f"Desteklenmeyen yevmiye biçimi. Seçenekler: {', '.join(JOURNAL_FORMATS)}")
+        fields = tuple(name.strip() for name in options.get("alanlar", "").split(",") if name.strip()) or tuple(JOURNAL_COLUMNS)
+        unknown = [name for name in fields if name not in JOURNAL_COLUMNS]
+        if unknown:
+            raise ValueError(f"Bilinmeyen yevmiye alanı: {', '.join(unknown)}. Seçenekler: {', '.join(JOURNAL_COLUMNS)}")
+        if options.get("genislikler"):
+            try:
+                widths = tuple(int(value) for value in options["genislikler"].split(","))
+            except ValueError:
+                raise ValueError("Alan genişlikleri virgülle ayrılmış tam sayılar olmalıdır.") from None
+            if len(widths) != len(fields) or min(widths) < 1:
+                raise ValueError("Her alan için pozitif bir genişlik verilmelidir.")
+        else:
+            widths = tuple(JOURNAL_WIDTHS[name] for name in fields)
+        delimiter = JOURNAL_DELIMITERS.get(options.get("ayrac", ";"))
+        decimal = options.get("ondalik", ",")
+        encoding = JOURNAL_ENCODINGS.get(options.get("kodlama", "utf-8"))
+        if delimiter is None or decimal not in (",", ".") or encoding is None:
+            raise ValueError("Ayraç (; , tab |), ondalık işareti (, .) veya kodlama (utf-8, cp1254) hatalı.")
+        if output_format == "csv" and delimiter == decimal:
+            raise ValueError("Ayraç ile ondalık işareti aynı olamaz.")
+        header = options.get("baslik", "1" if output_format == "csv" else "0") == "1"
+        return cls(output_format, fields, widths, delimiter, decimal, encoding, header)
+
+    @property
+    def extension(self) -> str:
+        return JOURNAL_FORMATS[self.output_format][0]
+
+    @property
+    def content_type(self) -> str:
+        return f"{JOURNAL_FORMATS[self.output_format][1]}; charset={self.encoding.removesuffix('-sig')}"
+
+    def check(self, results: ResultTable) -> None:
+        if self.output_format != "sabit":
+            return
+        vouchers = results.vouchers
+        amounts = [value for totals in vouchers.revaluation.values() for value in totals.values()] + list(vouchers.depreciation.values())
+        longest = {
+            "fis_no": len(str(len(vouchers.revaluation) + len(vouchers.depreciation))),
+            "tarih": len("31.12.2025"),
+            "fis_turu": len("AMORT") if vouchers.depreciation else len("YD"),
+            "hesap_kodu": max(map(len, [*results.assets.accounts.values, "257", "522", "770"])),
+            "kiymet_no": max(map(len, results.assets.kiymet_no), default=0),
+            "borc": max((len(self.amount(value)) for value in amounts), default=0),
+        }
+        longest["alacak"] = longest["borc"]
+        for name, width in zip(self.fields, self.widths):
+            if name not in JOURNAL_TRUNCATED and longest[name] > width:
+                raise ValueError(f"'{name}' alanı {width} karaktere sığmıyor; en az {longest[name]} karakter gerekir.")
+
+    def amount(self, value: float | None) -> str:
+        return "" if value is None else f"{value:.2f}".replace(".", self.decimal)
+
+    def line(self, entry: dict[str, Any]) -> str:
+        values = [self.amount(entry[name]) if name in JOURNAL_AMOUNTS else str(entry[name]) for name in self.fields]
+        return "".join(
+            value.rjust(width) if name in JOURNAL_AMOUNTS or name == "fis_no" else value.ljust(width)[:width]
+            for name, value, width in zip(self.fields, values, self.widths)
+        ) + "\r\n"
+
+
+def iter_journal_entries(results: ResultTable, islem_yili: int, donem: int, detail: bool = False) -> Iterator[dict[str, Any]]:
+    months = period_end_month(donem)
+    entry_date = date(islem_yili, months, calendar.monthrange(islem_yili, months)[1]).strftime("%d.%m.%Y")
+    assets = results.assets
+    vouchers = results.vouchers
+    number = 0
+
+    def entry(kind: str, account: str, asset_no: str, description: str, debit: float | None, credit: float | None) -> dict[str, Any]:
+        return {"fis_no": number, "tarih": entry_date, "fis_turu": kind, "hesap_kodu": account, "kiymet_no": asset_no, "aciklama": description, "borc": debit, "alacak": credit}
+
+    for account_code, totals in vouchers.revaluation.items():
+        number += 1
+        if not detail:
+            title = f"Yeniden Değerleme - {account_code}"
+            yield entry("YD", account_code, "", title, totals["asset_increase"], None)
+            yield entry("YD", "257", "", title, None, totals["accumulated_increase"])
+            yield entry("YD", "522", "", title, None, totals["fund_increase"])
+            continue
+        rows = np.flatnonzero((assets.aktif_hesap == _account_code(assets, account_code)) & (results["fund_increase"] > 0))
+        values = zip(rows.tolist(), results["revaluation_increase"][rows].tolist(), results["accumulated_increase"][rows].tolist(), results["fund_increase"][rows].tolist())
+        for row, asset_increase, accumulated_increase, fund_increase in values:
+            description = f"{assets.kiymet_ad[row]} yeniden değerleme artışı"
+            yield entry("YD", account_code, assets.kiymet_no[row], description, asset_increase, None)
+            yield entry("YD", "257", assets.kiymet_no[row], description, None, accumulated_increase)
+            yield entry("YD", "522", assets.kiymet_no[row], description, None, fund_increase)
+
+    for account_code, amount in vouchers.depreciation.items():
+        number += 1
+        if not detail:
+            title = f"Dönem Amortismanı - {account_code}"
+            yield entry("AMORT", "770", "", title, amount, None)
+            yield entry("AMORT", "257", "", title, None, amount)
+            continue
+        rows = np.flatnonzero((assets.aktif_hesap == _account_code(assets, account_code)) & (results["period_depreciation"] > 0))
+        for row, value in zip(rows.tolist(), results["period_depreciation"][rows].tolist()):
+            description = f"{assets.kiymet_ad[row]} dönem amortismanı"
+            yield entry("AMORT", assets.accounts[assets.gider_hesap[row]], assets.kiymet_no[row], description, value, None)
+            yield entry("AMORT", "257", assets.kiymet_no[row], description, None, value)
+
+
+def _account_code(assets: AssetTable, account: str) -> int:
+    code = assets.accounts.find(account)
+    return -1 if code is None else code
+
+
+def stream_journal(entries: Iterable[dict[str, Any]], layout: JournalLayout) -> Iterator[bytes]:
+    encoder = codecs.getincrementalencoder(layout.encoding)(errors="replace")
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=layout.delimiter)
+    if layout.header:
+        headers = [JOURNAL_COLUMNS[name] for name in layout.fields]
+        if layout.output_format == "csv":
+            writer.writerow(headers)
+        else:
+            buffer.write("".join(header.ljust(width)[:width] for header, width in zip(headers, layout.widths)) + "\r\n")
+    for index, entry in enumerate(entries, start=1):
+        if layout.output_format == "csv":
+            writer.writerow([layout.amount(entry[name]) if name in JOURNAL_AMOUNTS else entry[name] for name in layout.fields])
+        else:
+            buffer.write(layout.line(entry))
+        if index % JOURNAL_CHUNK_LINES == 0:
+            yield encoder.encode(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+    yield encoder.encode(buffer.getvalue(), final=True)
+
+
+def write_results(
+    results: list[dict[str, Any]] | ResultTable,
+    output_path: str | Path,
+    output_format: str,
+    islem_yili: int,
+    donem: int,
+    yd_orani: float,
+    progress: Callable[[int], None] | None = None,
+    sheets: Iterable[str] = (),
+    sheet_stats: dict[str, dict[str, float]] | None = None,
+    rates: RateTable | None = None,
+) -> dict[str, int]:
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Desteklenmeyen çıktı biçimi: {output_format}")
+    vouchers = result_vouchers(results)
+    if output_format == "xlsx":
+        return create_result_workbook(
+            results, output_path, islem_yili, donem, yd_orani, progress=progress, vouchers=vouchers, sheets=sheets, sheet_stats=sheet_stats, rates=rates
+        )
+    if sheets:
+        raise ValueError("Ek sayfalar yalnızca xlsx çıktısında seçilebilir.")
+
+    columns = result_columns(results)
+    if output_format == "csv":
+        write_results_csv(columns, vouchers, output_path)
+    elif output_format == "json":
+        with open(output_path, "w", encoding="utf-8") as stream:
+            write_results_json(columns, vouchers, stream, islem_yili, donem, yd_orani, rates)
+    else:
+        write_results_parquet(columns, vouchers, output_path)
+    if progress:
+        progress(vouchers.count)
+    return vouchers.summary()
+
+
+def write_results_csv(columns: dict[str, list[Any]], vouchers: VoucherAggregator, output_path: str | Path) -> None:
+    with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("sonuclar.csv", "w") as member, io.TextIOWrapper(member, encoding="utf-8-sig", newline="") as stream:
+            writer = csv.writer(stream)
+            writer.writerow(RESULT_COLUMNS.values())
+            writer.writerows(zip(*columns.values()))
+        with archive.open("fisler.csv", "w") as member, io.TextIOWrapper(member, encoding="utf-8-sig", newline="") as stream:
+            writer = csv.writer(stream)
+            writer.writerow(VOUCHER_COLUMNS.values())
+            writer.writerows(iter_voucher_lines(vouchers))
+
+
+def write_results_json(
+    columns: dict[str, list[Any]],
+    vouchers: VoucherAggregator,
+    stream: io.TextIOBase,
+    islem_yili: int,
+    donem: int,
+    yd_orani: float,
+    rates: RateTable | None = None,
+) -> None:
+    header = {"islem_yili": islem_yili, "donem": donem, "yd_orani": None if rates else yd_orani, "toplamlar": vouchers.totals}
+    if rates:
+        header["ufe_referans"] = rates.rates(islem_yili)[0]
+    stream.write(json.dumps(header, ensure_ascii=False)[:-1])
+    stream.write(', "sonuclar": [')
+    names = list(columns)
+    for index, values in enumerate(zip(*columns.values())):
+        if index:
+            stream.write(", ")
+        stream.write(json.dumps(dict(zip(names, values)), ensure_ascii=False, default=date.isoformat))
+    stream.write('], "fisler": ')
+    lines = [dict(zip(VOUCHER_COLUMNS, line)) for line in iter_voucher_lines(vouchers)]
+    stream.write(json.dumps(lines, ensure_ascii=False))
+    stream.write("}")
+
+
+def write_results_parquet(columns: dict[str, list[Any]], vouchers: VoucherAggregator, output_path: str | Path) -> None:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ValueError("Parquet çıktısı için pyarrow paketi kurulmalıdır.") from exc
+
+    lines = list(zip(*iter_voucher_lines(vouchers))) or [[] for _ in VOUCHER_COLUMNS]
+    voucher_table = pa.table(
+        {
+            "fis": pa.array(lines[0], pa.string()),
+            "hesap_kodu": pa.array(lines[1], pa.string()),
+            "borc": pa.array(lines[2], pa.float64()),
+            "alacak": pa.array(lines[3], pa.float64()),
+        }
+    )
+    with zipfile.ZipFile(output_path, "w") as archive:
+        with archive.open("sonuclar.parquet", "w") as member:
+            pq.write_table(pa.table(columns), member)
+        with archive.open("fisler.parquet", "w") as member:
+            pq.write_table(voucher_table, member)
+
+
+def iter_result_records(assets: list[Asset], results: ResultTable) -> Iterator[dict[str, Any]]:
+    names = list(results.columns)
+    values = [results[name].tolist() for name in names]
+    for asset, row in zip(assets, zip(*values)):
+        record: dict[str, Any] = {"asset": {**vars(asset), "tarih": asset.tarih.date().isoformat()}}
+        record.update(zip(names, row))
+        record["status"] = STATUS_LABELS[record["status"]]
+        yield record
+
+
+def stream_results_ndjson(chunks: Iterable[tuple[list[Asset], ResultTable]]) -> Iterator[str]:
+    vouchers = VoucherAggregator()
+    try:
+        for assets, results in chunks:
+            vouchers.merge(results.vouchers)
+            yield "".join(_json_line({"tur": "sonuc", **record}) for record in iter_result_records(assets, results))
+    except Exception as exc:
+        yield _json_line({"tur": "hata", "error": str(exc)})
+        return
+    for account_code, totals in vouchers.revaluation.items():
+        yield _json_line({"tur": "yd_fisi", "hesap_kodu": account_code, **totals})
+    for account_code, amount in vouchers.depreciation.items():
+        yield _json_line({"tur": "amortisman_fisi", "hesap_kodu": account_code, "tutar": amount})
+    yield _json_line({"tur": "ozet", **vouchers.summary(), "toplamlar": vouchers.totals})
+
+
+def stream_results_json(chunks: Iterable[tuple[list[Asset], ResultTable]]) -> Iterator[str]:
+    vouchers = VoucherAggregator()
+    yield '{"sonuclar": ['
+    separator = ""
+    try:
+        for assets, results in chunks:
+            vouchers.merge(results.vouchers)
+            records = [json.dumps(record, ensure_ascii=False) for record in iter_result_records(assets, results)]
+            if records:
+                yield separator + ", ".join(records)
+                separator = ", "
+    except Exception as exc:
+        yield "], " + json.dumps({"success": False, "error": str(exc)}, ensure_ascii=False)[1:]
+        return
+    footer = {
+        "success": True,
+        **vouchers.summary(),
+        "toplamlar": vouchers.totals,
+        "yd_fisleri": vouchers.revaluation,
+        "amortisman_fisleri": vouchers.depreciation,
+    }
+    yield "], " + json.dumps(footer, ensure_ascii=False)[1:]
+
+
+def _json_line(value: dict[str, Any]) -> str:
+    return json.dumps(value, ensure_ascii=False) + "\n"
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from calculator import PROGRESS_INTERVAL
+
+
+T = TypeVar("T")
+
+JOB_STAGES = ("rows_parsed", "rows_calculated", "rows_written")
+
+
+@dataclass
+class Job:
+    id: str
+    state: str = "queued"
+    stage: str = ""
+    progress: dict[str, int] = field(default_factory=lambda: dict.fromkeys(JOB_STAGES, 0))
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+
+    def set_progress(self, stage: str, rows: int) -> None:
+        self.progress[stage] = rows
+
+    def count(self, stage: str, rows: Iterable[T]) -> Iterator[T]:
+        count = 0
+        for row in rows:
+            count += 1
+            if count % PROGRESS_INTERVAL == 0:
+                self.progress[stage] = count
+            yield row
+        self.progress[stage] = count
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "stage": self.stage,
+            "progress": dict(self.progress),
+            "error": self.error,
+        }
+
+
+class JobManager:
+    def __init__(self, max_workers: int = 2, keep_seconds: int = 3600) -> None:
+        self.keep_seconds = keep_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hesapla")
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, function: Callable[..., dict[str, Any]], *args: Any) -> Job:
+        job = Job(id=uuid.uuid4().hex)
+        with self._lock:
+            self._purge()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, function, *args)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: Job, function: Callable[..., dict[str, Any]], *args: Any) -> None:
+        job.state = "running"
+        try:
+            job.result = function(*args, job=job)
+            job.state = "done"
+        except Exception as exc:
+            job.error = str(exc)
+            job.state = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _purge(self) -> None:
+        limit = time.time() - self.keep_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < limit]:
+            del self._jobs[job_id]
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024**2, 5 * 1024**2, 10 * 1024**2, 20 * 1024**2, 50 * 1024**2, 100 * 1024**2)
+ROW_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 250_000, 500_000, 1_000_000)
+
+
+def peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._definitions: dict[str, tuple[str, str, tuple[float, ...]]] = {}
+        self._values: dict[str, dict[tuple[tuple[str, str], ...], Any]] = {}
+
+    def counter(self, name: str, help_text: str) -> None:
+        self._define(name, "counter", help_text)
+
+    def gauge(self, name: str, help_text: str) -> None:
+        self._define(name, "gauge", help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: tuple[float, ...] = DURATION_BUCKETS) -> None:
+        self._define(name, "histogram", help_text, buckets)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[name][_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        buckets = self._definitions[name][2]
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values[name].get(key)
+            if series is None:
+                series = self._values[name][key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            series[0][bisect_left(buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, buckets) in self._definitions.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in self._values[name].items():
+                    if kind != "histogram":
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+                        continue
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(buckets, counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_format_labels(key + (('le', _format_value(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def _define(self, name: str, kind: str, help_text: str, buckets: tuple[float, ...] = ()) -> None:
+        with self._lock:
+            self._definitions[name] = (kind, help_text, tuple(sorted(buckets)))
+            self._values.setdefault(name, {})
+
+
+class StageTimer:
+    def __init__(self, metrics: Metrics, endpoint: str) -> None:
+        self.metrics = metrics
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.durations: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.durations[name] = self.durations.get(name, 0.0) + duration
+            self.metrics.observe("yd_stage_duration_seconds", duration, endpoint=self.endpoint, stage=name)
+
+    def count(self, name: str, value: int) -> None:
+        self.counts[name] = value
+
+    def finish(self, status: str) -> dict[str, Any]:
+        total = time.perf_counter() - self.started
+        peak = peak_rss_bytes()
+        self.metrics.observe("yd_request_duration_seconds", total, endpoint=self.endpoint, status=status)
+        self.metrics.inc("yd_requests_total", endpoint=self.endpoint, status=status)
+        self.metrics.set("yd_process_peak_rss_bytes", peak)
+        return {
+            "sureler": {name: round(value, 4) for name, value in self.durations.items()},
+            "toplam_sure": round(total, 4),
+            "sayilar": dict(self.counts),
+            "tepe_bellek_mb": round(peak / 1024 / 1024, 1),
+        }
+
+
+def create_metrics() -> Metrics:
+    metrics = Metrics()
+    metrics.counter("yd_requests_total", "Tamamlanan istek sayısı.")
+    metrics.histogram("yd_request_duration_seconds", "İstek başına toplam süre.")
+    metrics.histogram("yd_stage_duration_seconds", "Hesaplama aşamalarının süresi.")
+    metrics.counter("yd_rows_total", "Okunan satırlar (kabul edilen/atlanan).")
+    metrics.histogram("yd_rows_per_upload", "Yükleme başına kabul edilen satır sayısı.", ROW_BUCKETS)
+    metrics.histogram("yd_file_size_bytes", "Yüklenen ve üretilen dosya boyutları.", SIZE_BUCKETS)
+    metrics.gauge("yd_process_peak_rss_bytes", "Sürecin tepe bellek kullanımı (RSS).")
+    return metrics
+
+
+def _label_key(labels: dict[str, str]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: tuple[tuple[str, str], ...]) -> str:
+    if not key:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in key)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(key, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
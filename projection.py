@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+from calculator import add_result_styles, styled
+from engine import AssetTable, active_months_array, calculate_columns
+
+
+MAX_PROJECTION_YEARS = 100
+NET_TOLERANCE = 0.005
+SCHEDULE_HEADERS = [
+    "Sabit Kıymet",
+    "Açıklama",
+    "Aktif Hesap",
+    "Yıl",
+    "1. Dönem",
+    "2. Dönem",
+    "3. Dönem",
+    "4. Dönem",
+    "Yıllık Amortisman",
+    "Yıl Başı Net Değer",
+    "Yıl Sonu Net Değer",
+]
+
+
+def project_schedule(table: AssetTable, start_year: int, yd_orani: float = 0.0) -> Iterator[tuple[int, dict[str, np.ndarray]]]:
+    if not len(table):
+        return
+    first_year = calculate_columns(table, start_year, 4, yd_orani)
+    cost = first_year["revalued_cost"]
+    net = first_year["revalued_net"]
+    rate = table.amortisman_orani
+    end_year = min(int((table.year + table.omur - 1).max()), start_year + MAX_PROJECTION_YEARS - 1)
+
+    for year in range(start_year, end_year + 1):
+        annual = np.where(table.azalan, np.minimum(net * rate * 2, cost * 0.5), cost * rate)
+        remaining = np.maximum(net, 0.0)
+        annual = np.where(net < NET_TOLERANCE, 0.0, annual)
+
+        cumulative = [np.minimum(annual * active_months_array(table, year, months) / 12, remaining) for months in (3, 6, 9, 12)]
+        quarters = [cumulative[0]] + [cumulative[q] - cumulative[q - 1] for q in (1, 2, 3)]
+        quarters = [np.where(quarter < NET_TOLERANCE, 0.0, quarter) for quarter in quarters]
+        yearly = quarters[0] + quarters[1] + quarters[2] + quarters[3]
+
+        net_end = net - yearly
+        net_end = np.where(np.abs(net_end) < NET_TOLERANCE, 0.0, net_end)
+        rows = np.flatnonzero(yearly >= NET_TOLERANCE)
+        if len(rows):
+            yield year, {
+                "index": rows,
+                "quarters": np.column_stack([quarter[rows] for quarter in quarters]),
+                "annual": yearly[rows],
+                "net_start": net[rows],
+                "net_end": net_end[rows],
+            }
+        net = net_end
+
+
+def iter_schedule_rows(table: AssetTable, start_year: int, yd_orani: float = 0.0) -> Iterator[list[Any]]:
+    for year, columns in project_schedule(table, start_year, yd_orani):
+        quarters = columns["quarters"].tolist()
+        for index, quarter, annual, net_start, net_end in zip(
+            columns["index"].tolist(), quarters, columns["annual"].tolist(), columns["net_start"].tolist(), columns["net_end"].tolist()
+        ):
+            yield [
+                table.kiymet_no[index],
+                table.kiymet_ad[index],
+                table.accounts[table.aktif_hesap[index]],
+                year,
+                *quarter,
+                annual,
+                net_start,
+                net_end,
+            ]
+
+
+def create_schedule_workbook(table: AssetTable, output_path: str | Path, start_year: int, yd_orani: float = 0.0) -> dict[str, int]:
+    workbook = Workbook(write_only=True)
+    styles = add_result_styles(workbook)
+    sheet = workbook.create_sheet("Amortisman Planı")
+    for col, width in enumerate([12, 24, 12, 8, 16, 16, 16, 16, 18, 18, 18], start=1):
+        sheet.column_dimensions[get_column_letter(col)].width = width
+    sheet.freeze_panes = "A2"
+    sheet.append([styled(sheet, header, styles["result_header"]) for header in SCHEDULE_HEADERS])
+
+    count = 0
+    years: set[int] = set()
+    for row in iter_schedule_rows(table, start_year, yd_orani):
+        sheet.append(row[:4] + [styled(sheet, value, styles["result_amount"]) for value in row[4:]])
+        years.add(row[3])
+        count += 1
+    workbook.save(output_path)
+    return {"satir_sayisi": count, "yil_sayisi": len(years)}
+
+
+def write_schedule_csv(table: AssetTable, stream: TextIO, start_year: int, yd_orani: float = 0.0) -> dict[str, int]:
+    writer = csv.writer(stream)
+    writer.writerow(SCHEDULE_HEADERS)
+    count = 0
+    years: set[int] = set()
+    for row in iter_schedule_rows(table, start_year, yd_orani):
+        writer.writerow(row)
+        years.add(row[3])
+        count += 1
+    return {"satir_sayisi": count, "yil_sayisi": len(years)}
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import astuple, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from calculator import ASSET_TOTAL_FIELDS, DEFAULT_PASSENGER_CAR_RULES, RESULT_TOTAL_FIELDS, Asset, PassengerCarRules, VoucherAggregator
+from engine import AssetTable, ResultTable, calculate_table
+
+
+ASSET_FIELDS = tuple(field.name for field in fields(Asset))
+RESULT_FIELDS = ASSET_TOTAL_FIELDS + RESULT_TOTAL_FIELDS
+REGISTER_NAME = re.compile(r"[A-Za-z0-9_.-]{1,64}")
+MAX_SCENARIOS_PER_REGISTER = 20
+ACCOUNT_FIELDS = ("revaluation_count", "depreciation_count", "revaluation_increase", "accumulated_increase", "fund_increase", "period_depreciation")
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS assets (
+    id INTEGER PRIMARY KEY,
+    register TEXT NOT NULL,
+    kiymet_no TEXT NOT NULL,
+    kiymet_ad TEXT NOT NULL,
+    aktif_hesap TEXT NOT NULL,
+    gider_hesap TEXT NOT NULL,
+    tarih TEXT NOT NULL,
+    maliyet REAL NOT NULL,
+    omur INTEGER NOT NULL,
+    yontem TEXT NOT NULL,
+    binek TEXT NOT NULL,
+    amortisman_orani REAL NOT NULL,
+    birikmis_amortisman REAL NOT NULL,
+    net_deger REAL NOT NULL,
+    disposed_at TEXT,
+    updated_at TEXT NOT NULL,
+    UNIQUE (register, kiymet_no)
+);
+CREATE INDEX IF NOT EXISTS assets_active ON assets (register, disposed_at, id);
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    register TEXT NOT NULL,
+    islem_yili INTEGER NOT NULL,
+    donem INTEGER NOT NULL,
+    yd_orani REAL NOT NULL,
+    rules TEXT NOT NULL,
+    last_used TEXT NOT NULL,
+    UNIQUE (register, islem_yili, donem, yd_orani, rules)
+);
+CREATE TABLE IF NOT EXISTS results (
+    scenario_id INTEGER NOT NULL REFERENCES scenarios (id) ON DELETE CASCADE,
+    asset_id INTEGER NOT NULL,
+    aktif_hesap TEXT NOT NULL,
+    {", ".join(f"{name} REAL NOT NULL" for name in RESULT_FIELDS)},
+    PRIMARY KEY (scenario_id, asset_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_account ON results (scenario_id, aktif_hesap, asset_id);
+CREATE TABLE IF NOT EXISTS scenario_totals (
+    scenario_id INTEGER PRIMARY KEY REFERENCES scenarios (id) ON DELETE CASCADE,
+    asset_count INTEGER NOT NULL,
+    {", ".join(f"{name} REAL NOT NULL" for name in RESULT_FIELDS)}
+);
+CREATE TABLE IF NOT EXISTS account_totals (
+    scenario_id INTEGER NOT NULL REFERENCES scenarios (id) ON DELETE CASCADE,
+    aktif_hesap TEXT NOT NULL,
+    {", ".join(f"{name} {'INTEGER' if name.endswith('_count') else 'REAL'} NOT NULL" for name in ACCOUNT_FIELDS)},
+    PRIMARY KEY (scenario_id, aktif_hesap)
+) WITHOUT ROWID;
+DELETE FROM scenarios WHERE id NOT IN (SELECT scenario_id FROM scenario_totals);
+"""
+
+
+class AssetRegistry:
+    def __init__(self, path: str | Path, rules: PassengerCarRules = DEFAULT_PASSENGER_CAR_RULES) -> None:
+        self.path = Path(path)
+        self.rules = rules
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+
+    def registers(self) -> list[dict[str, int | str]]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT register, COUNT(*) - COUNT(disposed_at), COUNT(disposed_at), MAX(updated_at) FROM assets GROUP BY register ORDER BY register"
+            ).fetchall()
+        return [{"sicil": name, "aktif": active, "cikan": disposed, "guncelleme": updated} for name, active, disposed, updated in rows]
+
+    def apply(self, register: str, assets: Iterable[Asset] = (), disposals: Iterable[str] = (), replace: bool = False) -> dict[str, int]:
+        _check_name(register)
+        disposals = set(disposals)
+        incoming: dict[str, Asset] = {}
+        duplicates: set[str] = set()
+        for asset in assets:
+            if asset.kiymet_no in incoming:
+                duplicates.add(asset.kiymet_no)
+            incoming[asset.kiymet_no] = asset
+        if duplicates:
+            raise ValueError("Sicil için her satırda benzersiz bir kıymet numarası (ör. 'Demirbaş No' kolonu) olmalıdır, tekrar edenler: " + ", ".join(sorted(duplicates)[:20]))
+        conflicts = incoming.keys() & disposals
+        if conflicts:
+            raise ValueError("Aynı yüklemede hem güncellenen hem çıkarılan kıymetler var: " + ", ".join(sorted(conflicts)[:20]))
+
+        now = datetime.now().isoformat(timespec="seconds")
+        counts = {"eklenen": 0, "guncellenen": 0, "degismeyen": 0, "cikarilan": 0}
+        changed: list[int] = []
+        removed: list[int] = []
+        with self._lock, self._connect() as connection:
+            existing = {
+                row[1]: row
+                for row in connection.execute(f"SELECT id, {', '.join(ASSET_FIELDS)}, disposed_at FROM assets WHERE register = ?", (register,))
+            }
+            for kiymet_no, asset in incoming.items():
+                values = _asset_values(asset)
+                row = existing.get(kiymet_no)
+                if row is None:
+                    cursor = connection.execute(
+                        f"INSERT INTO assets (register, {', '.join(ASSET_FIELDS)}, updated_at) VALUES (?, {', '.join('?' * len(ASSET_FIELDS))}, ?)",
+                        (register, *values, now),
+                    )
+                    changed.append(cursor.lastrowid)
+                    counts["eklenen"] += 1
+                elif tuple(row[1:-1]) != values or row[-1] is not None:
+                    connection.execute(
+                        f"UPDATE assets SET {', '.join(f'{name} = ?' for name in ASSET_FIELDS)}, disposed_at = NULL, updated_at = ? WHERE id = ?",
+                        (*values, now, row[0]),
+                    )
+                    changed.append(row[0])
+                    counts["eklenen" if row[-1] is not None else "guncellenen"] += 1
+                else:
+                    counts["degismeyen"] += 1
+
+            to_dispose = set(disposals)
+            if replace:
+                to_dispose.update(kiymet_no for kiymet_no in existing if kiymet_no not in incoming)
+            for kiymet_no in sorted(to_dispose):
+                row = existing.get(kiymet_no)
+                if row is not None and row[-1] is None:
+                    connection.execute("UPDATE assets SET disposed_at = ?, updated_at = ? WHERE id = ?", (now, now, row[0]))
+                    removed.append(row[0])
+                    counts["cikarilan"] += 1
+
+            connection.execute("DELETE FROM scenarios WHERE register = ? AND rules != ?", (register, self.rules.fingerprint))
+            scenarios = connection.execute("SELECT id, islem_yili, donem, yd_orani FROM scenarios WHERE register = ?", (register,)).fetchall()
+            if scenarios and changed:
+                ids, table = _load_table(connection, "id IN (SELECT value FROM json_each(?))", (_json_ids(changed),), self.rules)
+            for scenario_id, islem_yili, donem, yd_orani in scenarios:
+                if removed:
+                    _delete_results(connection, scenario_id, removed)
+                if changed:
+                    _store_results(connection, scenario_id, ids, calculate_table(table, islem_yili, donem, yd_orani))
+        return counts
+
+    def table(self, register: str) -> AssetTable:
+        _check_name(register)
+        with self._connect() as connection:
+            return _load_table(connection, "register = ? AND disposed_at IS NULL", (register,), self.rules)[1]
+
+    def vouchers(self, register: str, islem_yili: int, donem: int, yd_orani: float) -> VoucherAggregator:
+        _check_name(register)
+        with self._lock, self._connect() as connection:
+            scenario_id = self._scenario(connection, register, islem_yili, donem, yd_orani)
+            revaluation = {
+                account: {"asset_increase": asset_increase, "accumulated_increase": accumulated_increase, "fund_increase": fund_increase}
+                for account, asset_increase, accumulated_increase, fund_increase in connection.execute(
+                    "SELECT aktif_hesap, revaluation_increase, accumulated_increase, fund_increase FROM account_totals AS totals "
+                    "WHERE scenario_id = ? AND revaluation_count > 0 ORDER BY (SELECT MIN(asset_id) FROM results "
+                    "WHERE results.scenario_id = totals.scenario_id AND results.aktif_hesap = totals.aktif_hesap AND fund_increase > 0)",
+                    (scenario_id,),
+                )
+            }
+            depreciation = dict(
+                connection.execute(
+                    "SELECT aktif_hesap, period_depreciation FROM account_totals AS totals "
+                    "WHERE scenario_id = ? AND depreciation_count > 0 ORDER BY (SELECT MIN(asset_id) FROM results "
+                    "WHERE results.scenario_id = totals.scenario_id AND results.aktif_hesap = totals.aktif_hesap AND period_depreciation > 0)",
+                    (scenario_id,),
+                )
+            )
+            row = connection.execute(f"SELECT asset_count, {', '.join(RESULT_FIELDS)} FROM scenario_totals WHERE scenario_id = ?", (scenario_id,)).fetchone()
+        return VoucherAggregator(revaluation, depreciation, dict(zip(RESULT_FIELDS, row[1:])), row[0])
+
+    def _scenario(self, connection: sqlite3.Connection, register: str, islem_yili: int, donem: int, yd_orani: float) -> int:
+        now = datetime.now().isoformat(timespec="microseconds")
+        row = connection.execute(
+            "SELECT id FROM scenarios WHERE register = ? AND islem_yili = ? AND donem = ? AND yd_orani = ? AND rules = ?",
+            (register, islem_yili, donem, yd_orani, self.rules.fingerprint),
+        ).fetchone()
+        if row:
+            connection.execute("UPDATE scenarios SET last_used = ? WHERE id = ?", (now, row[0]))
+            return row[0]
+
+        scenario_id = connection.execute(
+            "INSERT INTO scenarios (register, islem_yili, donem, yd_orani, rules, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+            (register, islem_yili, donem, yd_orani, self.rules.fingerprint, now),
+        ).lastrowid
+        ids, table = _load_table(connection, "register = ? AND disposed_at IS NULL", (register,), self.rules)
+        if not ids:
+            raise ValueError("Sicilde hesaplanacak sabit kıymet bulunamadı.")
+        _store_results(connection, scenario_id, ids, calculate_table(table, islem_yili, donem, yd_orani))
+        connection.execute(
+            "DELETE FROM scenarios WHERE register = ? AND id NOT IN (SELECT id FROM scenarios WHERE register = ? ORDER BY last_used DESC LIMIT ?)",
+            (register, register, MAX_SCENARIOS_PER_REGISTER),
+        )
+        return scenario_id
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+def _check_name(register: str) -> None:
+    if not REGISTER_NAME.fullmatch(register):
+        raise ValueError("Sicil adı yalnızca harf, rakam, '.', '_' ve '-' içerebilir.")
+
+
+def _asset_values(asset: Asset) -> tuple:
+    values = astuple(asset)
+    index = ASSET_FIELDS.index("tarih")
+    return values[:index] + (asset.tarih.isoformat(),) + values[index + 1 :]
+
+
+def _asset_from_row(row: tuple) -> Asset:
+    values = dict(zip(ASSET_FIELDS, row))
+    values["tarih"] = datetime.fromisoformat(values["tarih"])
+    return Asset(**values)
+
+
+def _load_table(connection: sqlite3.Connection, where: str, parameters: tuple, rules: PassengerCarRules) -> tuple[list[int], AssetTable]:
+    ids: list[int] = []
+    assets: list[Asset] = []
+    for row in connection.execute(f"SELECT id, {', '.join(ASSET_FIELDS)} FROM assets WHERE {where} ORDER BY id", parameters):
+        ids.append(row[0])
+        assets.append(_asset_from_row(row[1:]))
+    return ids, AssetTable.from_assets(assets, rules)
+
+
+def _store_results(connection: sqlite3.Connection, scenario_id: int, ids: list[int], results: ResultTable) -> None:
+    assets = results.assets
+    columns = [getattr(assets, name).tolist() for name in ASSET_TOTAL_FIELDS] + [results[name].tolist() for name in RESULT_TOTAL_FIELDS]
+    accounts = [assets.accounts[code] for code in assets.aktif_hesap.tolist()]
+    rows = list(zip(accounts, *columns))
+    previous = _stored_results(connection, scenario_id, ids)
+    connection.executemany(
+        f"INSERT OR REPLACE INTO results (scenario_id, asset_id, aktif_hesap, {', '.join(RESULT_FIELDS)}) "
+        f"VALUES (?, ?, ?, {', '.join('?' * len(RESULT_FIELDS))})",
+        ((scenario_id, asset_id, *row) for asset_id, row in zip(ids, rows)),
+    )
+    _update_totals(connection, scenario_id, previous, rows)
+
+
+def _delete_results(connection: sqlite3.Connection, scenario_id: int, ids: list[int]) -> None:
+    previous = _stored_results(connection, scenario_id, ids)
+    connection.execute("DELETE FROM results WHERE scenario_id = ? AND asset_id IN (SELECT value FROM json_each(?))", (scenario_id, _json_ids(ids)))
+    _update_totals(connection, scenario_id, previous, [])
+
+
+def _stored_results(connection: sqlite3.Connection, scenario_id: int, ids: list[int]) -> list[tuple]:
+    return connection.execute(
+        f"SELECT aktif_hesap, {', '.join(RESULT_FIELDS)} FROM results WHERE scenario_id = ? AND asset_id IN (SELECT value FROM json_each(?))",
+        (scenario_id, _json_ids(ids)),
+    ).fetchall()
+
+
+def _update_totals(connection: sqlite3.Connection, scenario_id: int, removed: list[tuple], added: list[tuple]) -> None:
+    fund = RESULT_FIELDS.index("fund_increase")
+    depreciation = RESULT_FIELDS.index("period_depreciation")
+    increases = [RESULT_FIELDS.index(name) for name in ("revaluation_increase", "accumulated_increase", "fund_increase")]
+    totals = [0.0] * len(RESULT_FIELDS)
+    accounts: dict[str, list[float]] = {}
+    for sign, rows in ((-1, removed), (1, added)):
+        for account, *values in rows:
+            for index, value in enumerate(values):
+                totals[index] += sign * value
+            delta = accounts.setdefault(account, [0] * len(ACCOUNT_FIELDS))
+            if values[fund] > 0:
+                delta[0] += sign
+                for offset, index in enumerate(increases, start=2):
+                    delta[offset] += sign * values[index]
+            if values[depreciation] > 0:
+                delta[1] += sign
+                delta[5] += sign * values[depreciation]
+    connection.execute(
+        f"INSERT INTO scenario_totals (scenario_id, asset_count, {', '.join(RESULT_FIELDS)}) VALUES (?, ?, {', '.join('?' * len(RESULT_FIELDS))}) "
+        f"ON CONFLICT (scenario_id) DO UPDATE SET asset_count = asset_count + excluded.asset_count, "
+        + ", ".join(f"{name} = {name} + excluded.{name}" for name in RESULT_FIELDS),
+        (scenario_id, len(added) - len(removed), *totals),
+    )
+    connection.executemany(
+        f"INSERT INTO account_totals (scenario_id, aktif_hesap, {', '.join(ACCOUNT_FIELDS)}) VALUES (?, ?, {', '.join('?' * len(ACCOUNT_FIELDS))}) "
+        f"ON CONFLICT (scenario_id, aktif_hesap) DO UPDATE SET "
+        + ", ".join(f"{name} = {name} + excluded.{name}" for name in ACCOUNT_FIELDS),
+        ((scenario_id, account, *delta) for account, delta in accounts.items()),
+    )
+
+
+def _json_ids(ids: list[int]) -> str:
+    return "[" + ",".join(map(str, ids)) + "]"
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from calculator import CALCULATOR_VERSION
+from engine import AssetTable, StringPool
+from storage import FileStore
+
+
+SNAPSHOT_MAGIC = b"YDSNAP1\n"
+SNAPSHOT_SUFFIX = ".ydsnap"
+SNAPSHOT_ALIGNMENT = 64
+NUMERIC_COLUMNS = (
+    "aktif_hesap",
+    "gider_hesap",
+    "year",
+    "month",
+    "day",
+    "maliyet",
+    "omur",
+    "azalan",
+    "binek",
+    "amortisman_orani",
+    "birikmis_amortisman",
+    "net_deger",
+    "passenger",
+)
+STRING_COLUMNS = ("kiymet_no", "kiymet_ad", "accounts")
+SNAPSHOT_ID = re.compile(r"[0-9a-f]{64}")
+
+
+class SnapshotStore:
+    def __init__(self, store: FileStore, salt: str = "") -> None:
+        self.store = store
+        self.salt = salt
+
+    def key(self, content: bytes, profile: str = "") -> str:
+        digest = hashlib.sha256(content)
+        digest.update(f"|{profile}|{self.salt}|{CALCULATOR_VERSION}".encode())
+        return digest.hexdigest()
+
+    def path(self, snapshot_id: str) -> Path:
+        if not SNAPSHOT_ID.fullmatch(snapshot_id):
+            raise KeyError(snapshot_id)
+        return self.store.path(snapshot_id + SNAPSHOT_SUFFIX)
+
+    def __contains__(self, snapshot_id: str) -> bool:
+        try:
+            return self.path(snapshot_id).exists()
+        except KeyError:
+            return False
+
+    def save(self, snapshot_id: str, table: AssetTable, **meta: Any) -> dict[str, Any]:
+        path = self.path(snapshot_id)
+        blocks: list[tuple[str, str, int, bytes]] = []
+        for name in STRING_COLUMNS:
+            values = table.accounts.values if name == "accounts" else getattr(table, name)
+            blocks.append((name, "str", len(values), "\0".join(values).encode("utf-8")))
+        for name in NUMERIC_COLUMNS:
+            column = np.ascontiguousarray(getattr(table, name))
+            blocks.append((name, column.dtype.str, len(column), column.tobytes()))
+
+        header: dict[str, Any] = {
+            "id": snapshot_id,
+            "rows": len(table),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "calculator_version": CALCULATOR_VERSION,
+            **meta,
+            "columns": [],
+        }
+        offset = 0
+        for name, dtype, length, data in blocks:
+            header["columns"].append({"name": name, "dtype": dtype, "length": length, "offset": offset, "nbytes": len(data)})
+            offset = _aligned(offset + len(data))
+        encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        data_start = _aligned(len(SNAPSHOT_MAGIC) + 8 + len(encoded))
+
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with temporary.open("wb") as stream:
+            stream.write(SNAPSHOT_MAGIC)
+            stream.write(struct.pack("<Q", len(encoded)))
+            stream.write(encoded)
+            for column, (_, _, _, data) in zip(header["columns"], blocks):
+                stream.seek(data_start + column["offset"])
+                stream.write(data)
+        os.replace(temporary, path)
+        self.store.add(path)
+        return _public(header)
+
+    def load(self, snapshot_id: str) -> tuple[AssetTable, dict[str, Any]]:
+        path = self.path(snapshot_id)
+        header, data_start = _read_header(path)
+        columns = {column["name"]: column for column in header["columns"]}
+        strings: dict[str, list[str]] = {}
+        with path.open("rb") as stream:
+            for name in STRING_COLUMNS:
+                column = columns[name]
+                stream.seek(data_start + column["offset"])
+                text = stream.read(column["nbytes"]).decode("utf-8")
+                strings[name] = text.split("\0") if column["length"] else []
+        numbers = {name: _map_column(path, columns[name], data_start) for name in NUMERIC_COLUMNS}
+        self.store.touch(path.name)
+        table = AssetTable(
+            kiymet_no=strings["kiymet_no"],
+            kiymet_ad=strings["kiymet_ad"],
+            accounts=StringPool(strings["accounts"]),
+            **numbers,
+        )
+        return table, _public(header)
+
+    def meta(self, snapshot_id: str) -> dict[str, Any]:
+        return _public(_read_header(self.path(snapshot_id))[0])
+
+    def list(self) -> list[dict[str, Any]]:
+        snapshots = []
+        for path in sorted(self.store.directory.glob(f"*{SNAPSHOT_SUFFIX}"), key=lambda item: item.stat().st_mtime, reverse=True):
+            try:
+                meta = _public(_read_header(path)[0])
+            except (OSError, ValueError):
+                continue
+            meta["bytes"] = path.stat().st_size
+            snapshots.append(meta)
+        return snapshots
+
+
+def _read_header(path: Path) -> tuple[dict[str, Any], int]:
+    with path.open("rb") as stream:
+        if stream.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"Geçersiz kayıt dosyası: {path.name}")
+        (length,) = struct.unpack("<Q", stream.read(8))
+        header = json.loads(stream.read(length).decode("utf-8"))
+    return header, _aligned(len(SNAPSHOT_MAGIC) + 8 + length)
+
+
+def _map_column(path: Path, column: dict[str, Any], data_start: int) -> np.ndarray:
+    dtype = np.dtype(column["dtype"])
+    if not column["length"]:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=data_start + column["offset"], shape=(column["length"],))
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+
+def _public(header: dict[str, Any]) -> dict[str, Any]:
+    return {name: value for name, value in header.items() if name != "columns"}
@@ -4,6 +4,7 @@ const fileInfo = document.getElementById("fileInfo");
 const fileName = document.getElementById("fileName");
 const form = document.getElementById("calculationForm");
 const loading = document.getElementById("loading");
+const loadingText = document.getElementById("loadingText");
 const result = document.getElementById("result");
 const error = document.getElementById("error");
 const submitBtn = document.getElementById("submitBtn");
@@ -38,38 +39,84 @@ function showFileName(name) {
     fileInfo.classList.add("show");
 }
 
+const POLL_INTERVAL_MS = 1000;
+const STAGE_LABELS = {
+    parse: "Satırlar okunuyor",
+    calculate: "Hesaplama yapılıyor",
+    write: "Excel dosyası yazılıyor",
+};
+
+function sleep(ms) {
+    return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+function showProgress(job) {
+    const label = STAGE_LABELS[job.stage] || "Hesaplama sırada bekliyor";
+    const { rows_parsed: parsed, rows_calculated: calculated, rows_written: written } = job.progress || {};
+    loadingText.textContent = `${label}... (okunan: ${parsed || 0}, hesaplanan: ${calculated || 0}, yazılan: ${written || 0})`;
+}
+
+function showResult(data) {
+    document.getElementById("sabitKiymetSayisi").textContent = `${data.sabit_kiymet_sayisi} adet`;
+    document.getElementById("ydFisSayisi").textContent = `${data.yd_fis_sayisi} adet`;
+    document.getElementById("amortismanFisSayisi").textContent = `${data.amortisman_fis_sayisi} adet`;
+    const formats = Object.entries(data.kolon_bicimleri || {}).map(([column, format]) => `${column}: ${format}`);
+    document.getElementById("kolonBicimleri").textContent = formats.join(", ") || "-";
+    downloadBtn.onclick = () => {
+        window.location.href = data.download_url;
+    };
+    result.classList.add("show");
+}
+
+function showError(message) {
+    error.textContent = message;
+    error.classList.add("show");
+}
+
+async function waitForJob(statusUrl) {
+    while (true) {
+        const response = await fetch(statusUrl);
+        const job = await response.json();
+        if (!response.ok || !job.success) {
+            throw new Error(job.error || "İşlem durumu alınamadı.");
+        }
+        if (job.state === "done") {
+            return job;
+        }
+        if (job.state === "failed") {
+            throw new Error(job.error || "Bir hata oluştu.");
+        }
+        showProgress(job);
+        await sleep(POLL_INTERVAL_MS);
+    }
+}
+
 form.addEventListener("submit", async (event) => {
     event.preventDefault();
     result.classList.remove("show");
     error.classList.remove("show");
+    loadingText.textContent = "Dosya yükleniyor...";
     loading.classList.add("show");
     submitBtn.disabled = true;
 
     try {
+        const formData = new FormData(form);
+        formData.set("async", "1");
         const response = await fetch("/hesapla", {
             method: "POST",
-            body: new FormData(form),
+            body: formData,
         });
         const data = await response.json();
-        loading.classList.remove("show");
 
         if (response.ok && data.success) {
-            document.getElementById("sabitKiymetSayisi").textContent = `${data.sabit_kiymet_sayisi} adet`;
-            document.getElementById("ydFisSayisi").textContent = `${data.yd_fis_sayisi} adet`;
-            document.getElementById("amortismanFisSayisi").textContent = `${data.amortisman_fis_sayisi} adet`;
-            downloadBtn.onclick = () => {
-                window.location.href = data.download_url;
-            };
-            result.classList.add("show");
+            showResult(data.status_url ? await waitForJob(data.status_url) : data);
         } else {
-            error.textContent = data.error || "Bir hata oluştu.";
-            error.classList.add("show");
+            showError(data.error || "Bir hata oluştu.");
         }
     } catch (err) {
-        loading.classList.remove("show");
-        error.textContent = `Bağlantı hatası: ${err.message}`;
-        error.classList.add("show");
+        showError(err instanceof TypeError ? `Bağlantı hatası: ${err.message}` : err.message);
     } finally {
+        loading.classList.remove("show");
         submitBtn.disabled = false;
     }
 });
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class FileStore:
+    def __init__(self, directory: Path, max_bytes: int, ttl_seconds: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._files: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self.directory.mkdir(exist_ok=True)
+        self.sweep()
+
+    def path(self, name: str) -> Path:
+        return self.directory / name
+
+    def add(self, path: Path) -> None:
+        with self._lock:
+            self._files[path.name] = (path.stat().st_size, time.time())
+            self._evict(time.time())
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._files
+
+    def touch(self, name: str) -> None:
+        with self._lock:
+            if name in self._files:
+                self._files[name] = (self._files[name][0], time.time())
+
+    def sweep(self) -> None:
+        with self._lock:
+            known = self._files
+            self._files = {}
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or entry.name.startswith("."):
+                        continue
+                    stat = entry.stat()
+                    last_access = known[entry.name][1] if entry.name in known else stat.st_mtime
+                    self._files[entry.name] = (stat.st_size, last_access)
+            self._evict(time.time())
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"files": len(self._files), "bytes": sum(size for size, _ in self._files.values())}
+
+    def start_sweeper(self, interval_seconds: int) -> threading.Thread:
+        def run() -> None:
+            while True:
+                time.sleep(interval_seconds)
+                self.sweep()
+
+        thread = threading.Thread(target=run, name=f"sweeper-{self.directory.name}", daemon=True)
+        thread.start()
+        return thread
+
+    def _evict(self, now: float) -> None:
+        for name in [name for name, (_, last_access) in self._files.items() if now - last_access > self.ttl_seconds]:
+            self._remove(name)
+        total = sum(size for size, _ in self._files.values())
+        for name in sorted(self._files, key=lambda item: self._files[item][1]):
+            if total <= self.max_bytes or len(self._files) == 1:
+                break
+            total -= self._files[name][0]
+            self._remove(name)
+
+    def _remove(self, name: str) -> None:
+        del self._files[name]
+        (self.directory / name).unlink(missing_ok=True)